@@ -1,32 +1,719 @@
 import re
-import fitz  # PyMuPDF
+import os
 import spacy
-import csv
-import nltk
+from bisect import bisect_right
+from itertools import islice, accumulate
+from collections import namedtuple, Counter
 from spacy.matcher import Matcher
-
-nltk.download('punkt')
-
-# Load spaCy English model
-nlp = spacy.load('en_core_web_sm')
-
-def load_keywords(file_path):
-    with open(file_path, 'r', encoding='utf-8') as file:
-        reader = csv.reader(file)
-        return set(row[0] for row in reader)
+from pdf_ingest import ParsedPDF, load_pdf, read_pdf_source, iter_pdf_pages
+from result_cache import ResultCache, model_fingerprint, pdf_digest
+from near_duplicates import NearDuplicateIndex
+from instrumentation import NULL_METRICS
+from budgets import NO_BUDGET
+from taxonomy import TaxonomyRegistry, load_keywords
+from sections import segment_sections
+from position_scorer import NO_POSITION, load_positions_keywords
+from languages import LanguageDetector, LANGUAGES_CSV_PATH, LANGUAGE_LEVELS_CSV_PATH
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+
+SKILLS_MODEL_PATH = os.path.join(BASE_DIR, 'TrainedModel', 'skills')
+SKILLS_CSV_PATH = os.path.join(DATA_DIR, 'newSkills.csv')
+UPDATED_SKILLS_CSV_PATH = os.path.join(DATA_DIR, 'UpdatedSkills.csv')
+MAJORS_CSV_PATH = os.path.join(DATA_DIR, 'majors.csv')
+POSITIONS_CSV_PATH = os.path.join(DATA_DIR, 'position.csv')
+SUGGESTED_SKILLS_CSV_PATH = os.path.join(DATA_DIR, 'sugestedSkills.csv')
+RESULT_CACHE_PATH = os.path.join(DATA_DIR, 'result_cache.db')
+
+# one entry per input of a batch run; exactly one of result / error is set
+BatchResult = namedtuple('BatchResult', ['source', 'result', 'error'])
+
+# en_core_web_sm components each result field depends on; POS comes from tagger + attribute_ruler
+FIELD_PIPES = {
+    'name': ('tok2vec', 'tagger', 'attribute_ruler'),
+    'email': (),
+    'phone': (),
+    'education': ('ner',),
+    'skills': (),
+    'major': (),
+    'experience_level': ('tok2vec', 'tagger', 'attribute_ruler'),
+    'suggested_position': ('tok2vec', 'tagger', 'attribute_ruler', 'lemmatizer'),
+    'suggested_positions': ('tok2vec', 'tagger', 'attribute_ruler', 'lemmatizer'),
+    'languages': (),
+    'links': (),
+    'skill_gaps': (),
+}
+
+# fields filled from the experience verbs and the position scorer
+EXPERIENCE_FIELDS = {'experience_level', 'suggested_position', 'suggested_positions'}
+
+# bumped whenever the shape of a result changes, so cached results of the old shape are not served
+RESULT_VERSION = 4
+
+# fields a streaming parse can usually settle from the first page alone
+CONTACT_FIELDS = {'name', 'email', 'phone', 'links'}
+
+# how the trained SKILL recognizer contributes to `skills`:
+# off = gazetteer only (the recognizer is not even loaded), union = gazetteer + NER, ner = NER only
+SKILLS_NER_MODES = ('off', 'union', 'ner')
+SKILLS_NER_PIPES = ('skills_ner', 'skill_spans')
+
+# what the recognizer reads: the whole document, or only the skill sections and skill-dense lines
+# (the whole document again when a resume has no skill section)
+SKILLS_NER_SCOPES = ('document', 'sections')
+SKILL_SECTIONS = ('skills', 'projects')
+# a line outside the skill sections is still read when the gazetteer finds this many skills in it
+SKILL_DENSE_LINE_MATCHES = 2
+
+@spacy.Language.component('skill_spans')
+def skill_spans(doc):
+    # move SKILL entities into their own span group and leave the tokens unannotated for the base ner
+    doc.spans['skills'] = [ent for ent in doc.ents if ent.label_ == 'SKILL']
+    doc.set_ents([], default='missing')
+    return doc
+
+# ----------------------------------Parser Engine---------------------------------
+class ResumeParser:
+    """Owns the spaCy pipelines, matchers and keyword tables; everything is built once."""
+
+    def __init__(self, model='en_core_web_sm', skills_model=SKILLS_MODEL_PATH,
+                 skills_csvs=(SKILLS_CSV_PATH, UPDATED_SKILLS_CSV_PATH), majors_csv=MAJORS_CSV_PATH,
+                 positions_csv=POSITIONS_CSV_PATH, suggested_skills_csv=SUGGESTED_SKILLS_CSV_PATH,
+                 languages_csv=LANGUAGES_CSV_PATH, language_levels_csv=LANGUAGE_LEVELS_CSV_PATH,
+                 cache_path=None, skills_ner='off', skills_ner_scope='document',
+                 instrumentation=None, max_pages=None, max_chars=None, dedup_threshold=None, budget=None,
+                 artifacts_path=None, taxonomy_check_interval=5.0):
+        if skills_ner not in SKILLS_NER_MODES:
+            raise ValueError(f"skills_ner must be one of {', '.join(SKILLS_NER_MODES)}")
+        if skills_ner_scope not in SKILLS_NER_SCOPES:
+            raise ValueError(f"skills_ner_scope must be one of {', '.join(SKILLS_NER_SCOPES)}")
+        self.nlp = spacy.load(model)
+        self.skills_model = skills_model
+        self.skills_ner = skills_ner
+        self.skills_ner_scope = skills_ner_scope
+        self._nlp_skills = None
+        if skills_ner != 'off' and skills_ner_scope == 'document':
+            # one tokenization and one pass produce both the base entities and doc.spans['skills']
+            self.nlp.add_pipe('ner', name='skills_ner', source=self.nlp_skills, before='ner')
+            self.nlp.add_pipe('skill_spans', before='ner')
+
+        self.name_matcher = Matcher(self.nlp.vocab)
+        self.name_matcher.add('NAME', [[{'POS': 'PROPN'}, {'POS': 'PROPN'}]])
+        self.email_matcher = Matcher(self.nlp.vocab)
+        self.email_matcher.add('EMAIL', [[{'LIKE_EMAIL': True}]])
+
+        # the keyword tables live in swappable snapshots; CSV edits are picked up within taxonomy_check_interval
+        # seconds (None: only through reload_taxonomy)
+        self.taxonomy_registry = TaxonomyRegistry(
+            self.nlp, {'skills': skills_csvs, 'majors': (majors_csv,), 'positions': (positions_csv,),
+                       'skill_gaps': (suggested_skills_csv,), 'languages': (languages_csv, language_levels_csv)},
+            artifacts_path=artifacts_path, check_interval=taxonomy_check_interval)
+        self._language_detector = None
+
+        # cached results are keyed by the model settings plus the taxonomy version they were extracted with
+        self._fingerprint_files = [os.path.join(skills_model, 'meta.json')]
+        self._fingerprint_extra = (skills_ner, skills_ner_scope, RESULT_VERSION)
+        self._fingerprints = {}
+        self.cache = ResultCache(cache_path, self.fingerprint) if cache_path else None
+        # texts at least this similar to an already parsed one reuse its cached result; None turns it off
+        if dedup_threshold is not None and self.cache is None:
+            raise ValueError("dedup_threshold needs a cache_path to keep the results it reuses")
+        self.near_duplicates = NearDuplicateIndex(cache_path, dedup_threshold) if dedup_threshold is not None else None
+        self.instrumentation = instrumentation
+        # caps on how much of a document is read at all; None reads everything
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        # a budgets.Budget: time limits per document and per stage; a stage that runs out is dropped from the result
+        self.budget = budget
+
+    @property
+    def taxonomy(self):
+        # the snapshot pinned by the parse running in this thread, else the current one
+        return self.taxonomy_registry.snapshot()
+
+    @property
+    def skills_gazetteer(self):
+        return self.taxonomy.skills_gazetteer
+
+    @property
+    def major_keywords(self):
+        return self.taxonomy.major_keywords
+
+    @property
+    def position_scorer(self):
+        return self.taxonomy.position_scorer
+
+    @property
+    def positions_keywords(self):
+        return self.taxonomy.position_scorer.positions_keywords
+
+    @property
+    def gap_recommender(self):
+        return self.taxonomy.gap_recommender
+
+    @property
+    def language_table(self):
+        return self.taxonomy.language_table
+
+    @property
+    def fingerprint(self):
+        version = self.taxonomy.version
+        if version not in self._fingerprints:
+            self._fingerprints[version] = model_fingerprint(self.nlp, self._fingerprint_files,
+                                                            extra=(*self._fingerprint_extra, version))
+        return self._fingerprints[version]
+
+    def reload_taxonomy(self):
+        # re-hash every CSV now instead of waiting for the next check; returns the registry's stats
+        self.taxonomy_registry.reload()
+        return self.taxonomy_registry.stats()
+
+    def warm_up(self):
+        # load everything that is otherwise loaded on first use, e.g. in a parent process before forking workers
+        self.nlp("warm up")
+        if self.skills_ner != 'off':
+            self.nlp_skills("warm up")
+        # the langdetect profiles stay lazy: only detect_language uses them, parse never does
+        return self
+
+    @property
+    def nlp_skills(self):
+        # the standalone skills pipeline, only loaded when something asks for it
+        if self._nlp_skills is None:
+            self._nlp_skills = spacy.load(self.skills_model)
+        return self._nlp_skills
+
+    @property
+    def language_detector(self):
+        # langdetect profiles are read on first use and kept
+        if self._language_detector is None:
+            self._language_detector = LanguageDetector()
+        return self._language_detector
+
+    # ----------------------------------Extract Name------------------------------
+    def extract_name(self, text):
+        nlp_text = self.nlp(text) if isinstance(text, str) else text
+        for match_id, start, end in self.name_matcher(nlp_text):
+            span = nlp_text[start:end]
+            return span.text
+        return None
+
+    # ----------------------------------Extract Email-----------------------------
+    def extract_email(self, doc):
+        for match_id, start, end in self.email_matcher(doc):
+            return doc[start:end].text
+        return ""
+
+    # ----------------------------------Extract Skills----------------------------
+    def find_skills(self, doc):
+        # every gazetteer hit with its character offsets, for highlighting and deduplication
+        return self.skills_gazetteer.find(doc)
+
+    def csv_skills(self, doc):
+        return self.skills_gazetteer.match_skills(doc)
+
+    def skill_regions(self, doc, sections=None, matches=None):
+        # merged character ranges of the skill sections and skill-dense lines; None when there is no skill section
+        if sections is None:
+            sections = segment_sections(doc.text)
+        regions = [span for name in SKILL_SECTIONS for span in sections.spans(name)]
+        if not regions:
+            return None
+        if matches is None:
+            matches = self.find_skills(doc)
+        line_starts = [0, *accumulate(len(line) for line in sections.line_texts)]
+        per_line = Counter(bisect_right(line_starts, match.start_char) - 1 for match in matches)
+        regions.extend((line_starts[line], line_starts[line + 1])
+                       for line, count in per_line.items() if count >= SKILL_DENSE_LINE_MATCHES)
+
+        merged = []
+        for start, end in sorted(regions):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+            else:
+                merged.append((start, end))
+        return merged
+
+    def scoped_skill_ents(self, doc, sections=None, matches=None, metrics=NULL_METRICS):
+        regions = self.skill_regions(doc, sections, matches) or [(0, len(doc.text))]
+        skill_ents = []
+        read = 0
+        for region_doc in self.nlp_skills.pipe(doc.text[start:end] for start, end in regions):
+            read += len(region_doc)
+            skill_ents.extend(region_doc.ents)
+        metrics.count('skills_ner_tokens', read)
+        metrics.count('skills_ner_tokens_skipped', max(len(doc) - read, 0))
+        return skill_ents
+
+    def extract_skills_from_ner(self, doc, sections=None, matches=None, metrics=NULL_METRICS):
+        non_skill_labels = {'DATE', 'TIME', 'PERCENT', 'MONEY', 'QUANTITY', 'ORDINAL', 'CARDINAL', 'EMAIL'}
+        skills = set()
+        if 'skills' in doc.spans:
+            skill_ents = doc.spans['skills']
+        elif self.skills_ner_scope == 'sections':
+            skill_ents = self.scoped_skill_ents(doc, sections, matches, metrics)
+        else:
+            skill_ents = self.nlp_skills(doc.text).ents
+        for ent in skill_ents:
+            if ent.label_ == 'SKILL' and ent.label_ not in non_skill_labels and not ent.text.isdigit():
+                # a listed skill is reported the way the CSV spells it, so the union does not hold it twice
+                skill_text = self.skills_gazetteer.canonical(ent.text) or ''.join(filter(str.isalpha, ent.text))
+                if skill_text:
+                    skills.add(skill_text)
+        return skills
+
+    def extract_skills(self, doc, sections=None, metrics=NULL_METRICS):
+        # the gazetteer hits are found once: they are the CSV skills and pick the skill-dense lines
+        matches = None
+        if self.skills_ner != 'ner' or self.skills_ner_scope == 'sections':
+            matches = self.find_skills(doc)
+        skills_csv = {match.skill for match in matches} if self.skills_ner != 'ner' else set()
+        skills_ner = set()
+        if self.skills_ner != 'off':
+            skills_ner = self.extract_skills_from_ner(doc, sections, matches, metrics)
+        filtered_skills_ner = {skill for skill in skills_ner if is_valid_skill(skill)}
+        filtered_skills_csv = {skill for skill in skills_csv if is_valid_skill(skill)}
+
+        # an NER skill is dropped when a CSV skill differs from it only in case, spacing or punctuation
+        csv_keys = {skill_key(skill) for skill in filtered_skills_csv}
+        combined_skills = filtered_skills_csv.union(
+            skill for skill in filtered_skills_ner if skill_key(skill) not in csv_keys)
+
+        return list(combined_skills)
+
+    # ----------------------------------Extract Major-----------------------------
+    def extract_major(self, doc):
+        lower_text = doc.text.lower()
+        for keyword, lower_keyword in self.major_keywords:
+            if lower_keyword in lower_text:
+                return keyword
+        return ""
+
+    # --------------------------------Extract Experience--------------------------
+    def extract_experience(self, doc):
+        return self.experience_from_verbs(experience_verbs(doc), self.position_scorer.match(doc))
+
+    def experience_from_verbs(self, verbs, position_keywords=None):
+        senior_keywords = ['lead', 'manage', 'direct', 'oversee', 'supervise', 'orchestrate', 'govern']
+        mid_senior_keywords = ['develop', 'design', 'analyze', 'implement', 'coordinate', 'execute', 'strategize']
+        mid_junior_keywords = ['assist', 'support', 'collaborate', 'participate', 'aid', 'facilitate', 'contribute']
+
+        if any(keyword in verbs for keyword in senior_keywords):
+            level_of_experience = "Senior"
+        elif any(keyword in verbs for keyword in mid_senior_keywords):
+            level_of_experience = "Mid-Senior"
+        elif any(keyword in verbs for keyword in mid_junior_keywords):
+            level_of_experience = "Mid-Junior"
+        else:
+            level_of_experience = "Entry Level"
+
+        # without a parsed document the positions are scored on the verbs alone
+        if position_keywords is None:
+            position_keywords = self.position_scorer.match_terms(verbs)
+        suggested_positions = self.position_scorer.rank(position_keywords)
+
+        return {
+            'level_of_experience': level_of_experience,
+            'suggested_position': suggested_positions[0]['position'] if suggested_positions else NO_POSITION,
+            'suggested_positions': suggested_positions,
+        }
+
+    # --------------------------------Extract Languages---------------------------
+    def extract_languages(self, text, sections=None):
+        if sections is None:
+            sections = segment_sections(text)
+        return self.language_table.extract(text, sections)
+
+    def detect_language(self, text):
+        code = self.language_detector.detect(text)
+        return self.language_table.name_for_code(code) if code else "Unknown"
+
+    # -----------------------------------Suggestions------------------------------
+    def suggest_position(self, verbs):
+        return self.position_scorer.best(self.position_scorer.match_terms(verbs))
+
+    def rank_positions(self, docs, k=5, batch_size=1024):
+        # one ranked list of {'position', 'score'} per parsed document
+        return self.position_scorer.rank_docs(docs, k=k, batch_size=batch_size)
+
+    # -----------------------------------Full Parse-------------------------------
+    def parse(self, source, fields=None):
+        self.taxonomy_registry.maybe_reload()
+        with self.taxonomy_registry.pinned():
+            return self._parse(source, fields)
+
+    def _parse(self, source, fields=None):
+        metrics = self._new_metrics()
+        budget = self._new_budget()
+        disabled = self.disabled_pipes(fields)
+        with metrics.profiled():
+            pdf_hash, cached, pdf, signature = self._prepare(source, fields, metrics, budget)
+            if cached is not None:
+                result = select_fields(cached, fields)
+            else:
+                doc = None
+                if budget.allows('nlp'):
+                    with metrics.stage('nlp'), budget.limit('nlp'):
+                        doc = self.nlp(pdf.text, disable=disabled)
+                result = self.build_result(pdf, doc, fields, metrics, budget)
+                result = self._store(pdf_hash, pdf, result, fields, signature, budget)
+        return self._finish(result, metrics, source, budget)
+
+    def parse_stream(self, source, fields=None, max_pages=None, max_chars=None):
+        self.taxonomy_registry.maybe_reload()
+        with self.taxonomy_registry.pinned():
+            return self._parse_stream(source, fields, max_pages, max_chars)
+
+    def _parse_stream(self, source, fields=None, max_pages=None, max_chars=None):
+        metrics = self._new_metrics()
+        budget = self._new_budget()
+        with metrics.profiled():
+            result = self._stream_fields(source, fields, max_pages, max_chars, metrics, budget)
+        return self._finish(result, metrics, source, budget)
+
+    def _stream_fields(self, source, fields, max_pages, max_chars, metrics, budget):
+        # page at a time: at most one page of layout and one page-sized Doc are alive at once
+        wanted = set(FIELD_PIPES) if fields is None else set(fields)
+        disabled = self.disabled_pipes(fields)
+        max_pages = self.max_pages if max_pages is None else max_pages
+        max_chars = self.max_chars if max_chars is None else max_chars
+        contact_only = wanted <= CONTACT_FIELDS
+
+        found = {'name': None, 'email': "", 'phone': None, 'major': ""}
+        education, skills, verbs, links = [], set(), [], []
+        position_keywords = set()
+        section_languages, line_languages = [], []
+
+        pages = iter_pdf_pages(source, links='links' in wanted, max_pages=max_pages, max_chars=max_chars)
+        while True:
+            # a page that runs out of time ends the document; the pages read so far still count
+            page = None
+            if budget.allows('pdf'):
+                with metrics.stage('pdf'), budget.limit('pdf'):
+                    page = next(pages, None)
+            if page is None:
+                pages.close()
+                break
+            metrics.count('pages')
+            metrics.count('characters', len(page.text))
+            doc = None
+            if budget.allows('nlp'):
+                with metrics.stage('nlp'), budget.limit('nlp'):
+                    doc = self.nlp(page.text, disable=disabled)
+            # without the pipeline this page only feeds the fields that need no trained component
+            page_wanted = wanted if doc is not None else {field for field in wanted if not FIELD_PIPES[field]}
+            if doc is None:
+                doc = self.nlp.make_doc(page.text)
+            metrics.count('tokens', len(doc))
+            metrics.count('entities', len(doc.ents))
+
+            if 'name' in page_wanted and found['name'] is None and budget.allows('name'):
+                with metrics.stage('name'), budget.limit('name'):
+                    found['name'] = self.extract_name(doc)
+            if 'email' in page_wanted and not found['email'] and budget.allows('email'):
+                with metrics.stage('email'), budget.limit('email'):
+                    found['email'] = self.extract_email(doc)
+            if 'phone' in page_wanted and found['phone'] is None and budget.allows('phone'):
+                with metrics.stage('phone'), budget.limit('phone'):
+                    found['phone'] = extract_contact_number_from_resume(doc)
+            sections = None
+            if self.needs_sections(page_wanted) and budget.allows('sections'):
+                with metrics.stage('sections'), budget.limit('sections'):
+                    sections = segment_sections(page.text)
+            if 'education' in page_wanted and budget.allows('education'):
+                with metrics.stage('education'), budget.limit('education'):
+                    education.extend(extract_education_from_resume(doc, sections))
+            if ('skills' in page_wanted or 'skill_gaps' in page_wanted) and budget.allows('skills'):
+                with metrics.stage('skills'), budget.limit('skills'):
+                    skills.update(self.extract_skills(doc, sections, metrics))
+            if 'major' in page_wanted and not found['major'] and budget.allows('major'):
+                with metrics.stage('major'), budget.limit('major'):
+                    found['major'] = self.extract_major(doc)
+            if page_wanted & EXPERIENCE_FIELDS and budget.allows('experience'):
+                with metrics.stage('experience'), budget.limit('experience'):
+                    page_verbs = experience_verbs(doc)
+                    position_keywords |= self.position_scorer.match(doc)
+                    verbs.extend(page_verbs)
+            if 'languages' in page_wanted and budget.allows('languages'):
+                with metrics.stage('languages'), budget.limit('languages'):
+                    page_languages = self.language_table.from_sections(sections or segment_sections(page.text))
+                    line_languages.extend(self.language_table.from_lines(page.text))
+                    section_languages.extend(page_languages)
+            links.extend(page.links)
+
+            if contact_only and all(found[field] for field in wanted if field != 'links'):
+                pages.close()
+                break
+
+        found['education'] = education
+        found['skills'] = list(skills)
+        metrics.count('skills_matched', len(skills))
+        if wanted & EXPERIENCE_FIELDS and budget.allows('experience'):
+            with metrics.stage('experience'), budget.limit('experience'):
+                experience_info = self.experience_from_verbs(verbs, position_keywords)
+                found['experience_level'] = experience_info.get('level_of_experience')
+                found['suggested_position'] = experience_info.get('suggested_position')
+                found['suggested_positions'] = experience_info.get('suggested_positions')
+        # same fallback as LanguageTable.extract: any line naming a language when no languages section was found
+        found['languages'] = (self.language_table.merge(section_languages)
+                              or self.language_table.merge(line_languages))
+        found['links'] = classify_links(links)
+        if 'skill_gaps' in wanted and budget.allows('skill_gaps'):
+            with metrics.stage('skill_gaps'), budget.limit('skill_gaps'):
+                found['skill_gaps'] = self.gap_recommender.recommend(found['skills'])
+
+        return {field: found[field] for field in FIELD_PIPES if field in wanted and field in found}
+
+    def _new_metrics(self):
+        return self.instrumentation.new_call() if self.instrumentation is not None else NULL_METRICS
+
+    def _new_budget(self):
+        return self.budget.start() if self.budget is not None else NO_BUDGET
+
+    def _finish(self, result, metrics, source, budget=NO_BUDGET):
+        # the taxonomy version, metrics, timeouts and overruns ride along on the result but are never cached
+        result["taxonomy_version"] = self.taxonomy.version
+        if budget.timed_out:
+            result["timed_out"] = list(dict.fromkeys(budget.timed_out))
+        if budget.over_budget:
+            result["over_budget"] = list(dict.fromkeys(budget.over_budget))
+        if self.instrumentation is not None:
+            result["metrics"] = metrics.as_dict()
+            self.instrumentation.record(metrics, self, source)
+        return result
+
+    def needs_sections(self, wanted):
+        if 'education' in wanted or 'languages' in wanted:
+            return True
+        scoped_ner = self.skills_ner != 'off' and self.skills_ner_scope == 'sections'
+        return scoped_ner and ('skills' in wanted or 'skill_gaps' in wanted)
+
+    def disabled_pipes(self, fields):
+        # spaCy components none of the requested fields need
+        if fields is None:
+            return []
+        unknown = set(fields) - set(FIELD_PIPES)
+        if unknown:
+            raise ValueError(f"unknown fields: {', '.join(sorted(unknown))}")
+        needed = {pipe for field in fields for pipe in FIELD_PIPES[field]}
+        if 'skills' in fields or 'skill_gaps' in fields:
+            needed.update(SKILLS_NER_PIPES)
+        return [pipe for pipe in self.nlp.pipe_names if pipe not in needed]
+
+    def _prepare(self, source, fields=None, metrics=NULL_METRICS, budget=NO_BUDGET):
+        # (pdf_hash, cached result, ParsedPDF, MinHash signature); the PDF is only parsed on a cache miss,
+        # and a near-duplicate of a parsed text is answered before any spaCy work
+        links = fields is None or 'links' in fields
+        pdf_hash = None
+        if self.cache is not None and not isinstance(source, ParsedPDF):
+            with metrics.stage('cache'):
+                source = read_pdf_source(source)
+                pdf_hash = pdf_digest(source)
+                cached = self.cache.get(pdf_hash, self.fingerprint)
+            if cached is not None:
+                metrics.count('cache_hits')
+                return pdf_hash, cached, None, None
+            metrics.count('cache_misses')
+        with metrics.stage('pdf'):
+            pdf = load_pdf(source, links=links, max_pages=self.max_pages, max_chars=self.max_chars,
+                           budget=budget if budget is not NO_BUDGET else None)
+        metrics.count('pages', pdf.page_count)
+        metrics.count('characters', len(pdf.text))
+
+        signature = None
+        if self.near_duplicates is not None and budget.allows('dedup'):
+            with metrics.stage('dedup'):
+                signature = self.near_duplicates.signature(pdf.text)
+                match = self.near_duplicates.find(signature)
+                cached = self.cache.get(match[0], self.fingerprint) if match else None
+            if cached is not None:
+                metrics.count('near_duplicate_hits')
+                result = self._near_duplicate_result(cached, pdf, fields, metrics, budget)
+                if pdf_hash is not None and fields is None and not pdf.truncated and not budget.timed_out:
+                    self.cache.put(pdf_hash, result, self.fingerprint)
+                return pdf_hash, result, None, None
+        return pdf_hash, None, pdf, signature
+
+    def _near_duplicate_result(self, cached, pdf, fields=None, metrics=NULL_METRICS, budget=NO_BUDGET):
+        # a near-duplicate shares the resume body, not necessarily its owner: only the NLP-heavy fields are
+        # reused, the contact fields always come from this text (a tagger pass at most, for the name)
+        wanted = CONTACT_FIELDS if fields is None else CONTACT_FIELDS & set(fields)
+        doc = None
+        if 'name' not in wanted:
+            doc = self.nlp.make_doc(pdf.text)
+        elif budget.allows('nlp'):
+            with metrics.stage('nlp'), budget.limit('nlp'):
+                doc = self.nlp(pdf.text, disable=self.disabled_pipes(wanted))
+        result = {field: value for field, value in cached.items() if field not in CONTACT_FIELDS}
+        result.update(self.build_result(pdf, doc, wanted, metrics, budget))
+        return result
+
+    def _store(self, pdf_hash, pdf, result, fields=None, signature=None, budget=NO_BUDGET):
+        # only complete results are cached (every field, the whole document, no timeouts); a field subset is
+        # served from them on a hit
+        if pdf_hash is not None and fields is None and not pdf.truncated and not budget.timed_out:
+            self.cache.put(pdf_hash, result, self.fingerprint)
+            if self.near_duplicates is not None:
+                self.near_duplicates.add(pdf_hash, signature)
+        return result
+
+    def parse_many(self, sources, batch_size=32, n_process=1, fields=None):
+        # PDFs are read one chunk at a time so memory stays flat however many sources are passed
+        disabled = self.disabled_pipes(fields)
+        sources = iter(sources)
+        chunk_size = batch_size * max(n_process, 1)
+        while True:
+            chunk = list(islice(sources, chunk_size))
+            if not chunk:
+                break
+
+            # one snapshot per chunk; the yields stay outside the pins so the caller's code never runs inside one
+            self.taxonomy_registry.maybe_reload()
+            taxonomy = self.taxonomy_registry.current
+            prepared = []
+            with self.taxonomy_registry.pinned(taxonomy):
+                for source in chunk:
+                    metrics = self._new_metrics()
+                    budget = self._new_budget()
+                    try:
+                        prepared.append((metrics, budget, *self._prepare(source, fields, metrics, budget)))
+                    except Exception as exc:
+                        prepared.append(exc)
+
+            texts = [entry[4].text for entry in prepared if not isinstance(entry, Exception) and entry[4] is not None]
+            docs = self._pipe_docs(texts, batch_size, n_process, disabled)
+
+            for source, entry in zip(chunk, prepared):
+                if isinstance(entry, Exception):
+                    yield BatchResult(source, None, entry)
+                    continue
+                metrics, budget, pdf_hash, cached, pdf, signature = entry
+                if cached is None:
+                    # spaCy works a batch at a time, so the first document of each batch carries its cost;
+                    # a batch cannot be interrupted halfway, so here nlp is only recorded when over budget
+                    budget.restart()
+                    with metrics.stage('nlp'), budget.limit('nlp', interrupt=False):
+                        doc, error = next(docs)
+                    if error is not None:
+                        yield BatchResult(source, None, error)
+                        continue
+                with self.taxonomy_registry.pinned(taxonomy):
+                    try:
+                        if cached is not None:
+                            result = self._finish(select_fields(cached, fields), metrics, source, budget)
+                        else:
+                            result = self.build_result(pdf, doc, fields, metrics, budget)
+                            result = self._store(pdf_hash, pdf, result, fields, signature, budget)
+                            result = self._finish(result, metrics, source, budget)
+                        batch_result = BatchResult(source, result, None)
+                    except Exception as exc:
+                        batch_result = BatchResult(source, None, exc)
+                yield batch_result
+
+    def _pipe_docs(self, texts, batch_size, n_process, disabled):
+        # (doc, error) per text; once a batch fails (e.g. a text over nlp.max_length) the rest of the texts
+        # go through nlp() one at a time, so only the offending document comes back as an error
+        docs = self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process, disable=disabled)
+        for position in range(len(texts)):
+            try:
+                doc = next(docs)
+            except Exception:
+                break
+            yield doc, None
+        else:
+            return
+        for text in texts[position:]:
+            try:
+                doc = self.nlp(text, disable=disabled)
+            except Exception as exc:
+                yield None, exc
+                continue
+            yield doc, None
+
+    def build_result(self, pdf, doc, fields=None, metrics=NULL_METRICS, budget=NO_BUDGET):
+        wanted = FIELD_PIPES.keys() if fields is None else set(fields)
+        if doc is None:
+            # the pipeline ran out of time: the fields that need no trained component still come from the tokens
+            wanted = {field for field in wanted if not FIELD_PIPES[field]}
+            doc = self.nlp.make_doc(pdf.text)
+        result = {}
+        metrics.count('tokens', len(doc))
+        metrics.count('entities', len(doc.ents))
+
+        sections = None
+        if self.needs_sections(wanted) and budget.allows('sections'):
+            with metrics.stage('sections'), budget.limit('sections'):
+                sections = segment_sections(pdf.text)
+
+        # Basic information extraction
+        if 'name' in wanted and budget.allows('name'):
+            with metrics.stage('name'), budget.limit('name'):
+                result["name"] = self.extract_name(doc)
+        if 'email' in wanted and budget.allows('email'):
+            with metrics.stage('email'), budget.limit('email'):
+                result["email"] = self.extract_email(doc)
+        if 'phone' in wanted and budget.allows('phone'):
+            with metrics.stage('phone'), budget.limit('phone'):
+                result["phone"] = extract_contact_number_from_resume(doc)
+        if 'education' in wanted and budget.allows('education'):
+            with metrics.stage('education'), budget.limit('education'):
+                result["education"] = extract_education_from_resume(doc, sections)
+        skills = None
+        if ('skills' in wanted or 'skill_gaps' in wanted) and budget.allows('skills'):
+            with metrics.stage('skills'), budget.limit('skills'):
+                skills = self.extract_skills(doc, sections, metrics)
+        if skills is not None:
+            metrics.count('skills_matched', len(skills))
+            if 'skills' in wanted:
+                result["skills"] = skills
+        if 'major' in wanted and budget.allows('major'):
+            with metrics.stage('major'), budget.limit('major'):
+                result["major"] = self.extract_major(doc)
+        if wanted & EXPERIENCE_FIELDS and budget.allows('experience'):
+            with metrics.stage('experience'), budget.limit('experience'):
+                experience_info = self.extract_experience(doc)
+                if 'experience_level' in wanted:
+                    result["experience_level"] = experience_info.get('level_of_experience')
+                if 'suggested_position' in wanted:
+                    result["suggested_position"] = experience_info.get('suggested_position')
+                if 'suggested_positions' in wanted:
+                    result["suggested_positions"] = experience_info.get('suggested_positions')
+        if 'languages' in wanted and budget.allows('languages'):
+            with metrics.stage('languages'), budget.limit('languages'):
+                result["languages"] = self.extract_languages(pdf.text, sections)
+        if 'links' in wanted:
+            with metrics.stage('links'):
+                result["links"] = classify_links(pdf.links)
+        if 'skill_gaps' in wanted and skills is not None and budget.allows('skill_gaps'):
+            with metrics.stage('skill_gaps'), budget.limit('skill_gaps'):
+                result["skill_gaps"] = self.gap_recommender.recommend(skills)
+
+        return result
+
+def select_fields(result, fields):
+    if fields is None:
+        return result
+    return {key: value for key, value in result.items() if key in fields}
+
+_default_parser = None
+
+def get_default_parser():
+    global _default_parser
+    if _default_parser is None:
+        _default_parser = ResumeParser(cache_path=RESULT_CACHE_PATH)
+    return _default_parser
+
+def __getattr__(name):
+    # `app.nlp` / `app.nlp_skills` used to be module globals; load them on first access instead of on import
+    if name in ('nlp', 'nlp_skills'):
+        return getattr(get_default_parser(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+# --------------------------------------------------------------------------------
 
 # ----------------------------------Extract Name----------------------------------
 def extract_name(text):
-    nlp_text = nlp(text)
-    matcher = Matcher(nlp.vocab)
-    pattern = [{'POS': 'PROPN'}, {'POS': 'PROPN'}]
-    matcher.add('NAME', [pattern])
-
-    matches = matcher(nlp_text)
-    for match_id, start, end in matches:
-        span = nlp_text[start:end]
-        return span.text
-    return None
+    return get_default_parser().extract_name(text)
 # --------------------------------------------------------------------------------
 def classify_links(links):
     classified = {
@@ -51,25 +738,10 @@ def classify_links(links):
 
 # ----------------------------------Extract Email---------------------------------
 def extract_email(doc):
-    matcher = spacy.matcher.Matcher(nlp.vocab)
-    email_pattern = [{'LIKE_EMAIL': True}]
-    matcher.add('EMAIL', [email_pattern])
-
-    matches = matcher(doc)
-    for match_id, start, end in matches:
-        if match_id == nlp.vocab.strings['EMAIL']:
-            return doc[start:end].text
-    return ""
+    return get_default_parser().extract_email(doc)
 # --------------------------------------------------------------------------------
 def extract_links_from_pdf(pdf_path):
-    links = []
-    doc = fitz.open(pdf_path)
-    for page in doc:
-        for link in page.get_links():
-            uri = link.get("uri", None)
-            if uri:
-                links.append(uri)
-    return links
+    return load_pdf(pdf_path).links
 # ----------------------------------Extract Phone Number--------------------------
 def extract_contact_number_from_resume(doc):
     text = doc.text
@@ -81,9 +753,18 @@ def extract_contact_number_from_resume(doc):
 # --------------------------------------------------------------------------------
 
 # --------------------------------Extract Education-------------------------------
-def extract_education_from_resume(doc):
+def extract_education_from_resume(doc, sections=None):
+    # only the entities inside the education section(s) when the resume has one
+    entities = doc.ents
+    if sections is not None and 'education' in sections:
+        entities = []
+        for start, end in sections.spans('education'):
+            span = doc.char_span(start, end, alignment_mode='expand')
+            if span is not None:
+                entities.extend(span.ents)
+
     universities = []
-    for entity in doc.ents:
+    for entity in entities:
         if entity.label_ == "ORG" and ("university" in entity.text.lower() or "college" in entity.text.lower() or "institute" in entity.text.lower()):
             universities.append(entity.text)
     return universities
@@ -91,165 +772,78 @@ def extract_education_from_resume(doc):
 
 # ----------------------------------Extract Skills--------------------------------
 def csv_skills(doc):
-    skills_keywords = load_keywords('data/newSkills.csv')
-    skills = set()
+    return get_default_parser().csv_skills(doc)
 
-    for keyword in skills_keywords:
-        if keyword.lower() in doc.text.lower():
-            skills.add(keyword)
-
-    return skills
-
-nlp_skills = spacy.load('TrainedModel/skills')
+def find_skills(doc):
+    return get_default_parser().find_skills(doc)
 
 def extract_skills_from_ner(doc):
-    non_skill_labels = {'DATE', 'TIME', 'PERCENT', 'MONEY', 'QUANTITY', 'ORDINAL', 'CARDINAL', 'EMAIL'}
-    skills = set()
-    for ent in nlp_skills(doc.text).ents:
-        if ent.label_ == 'SKILL' and ent.label_ not in non_skill_labels and not ent.text.isdigit():
-            skill_text = ''.join(filter(str.isalpha, ent.text))
-            if skill_text:
-                skills.add(skill_text)
-    return skills
+    return get_default_parser().extract_skills_from_ner(doc)
 
 def is_valid_skill(skill_text):
     return len(skill_text) > 1 and not any(char.isdigit() for char in skill_text)
 
-def extract_skills(doc):
-    skills_csv = csv_skills(doc)
-    skills_ner = extract_skills_from_ner(doc)  # comment out if no NER model
-    filtered_skills_ner = {skill for skill in skills_ner if is_valid_skill(skill)}
-    filtered_skills_csv = {skill for skill in skills_csv if is_valid_skill(skill)}
+def skill_key(skill_text):
+    # letters only, lowercased: "Data Visualization", "DataVisualization" and "data-visualization" are one skill
+    return ''.join(filter(str.isalpha, skill_text)).lower()
 
-    combined_skills = filtered_skills_csv.union(filtered_skills_ner)
-    combined_skills = filtered_skills_csv
-
-    return list(combined_skills)
+def extract_skills(doc):
+    return get_default_parser().extract_skills(doc)
 # --------------------------------------------------------------------------------
 
 # ----------------------------------Extract Major---------------------------------
 def extract_major(doc):
-    major_keywords = load_keywords('data/majors.csv')
-    for keyword in major_keywords:
-        if keyword.lower() in doc.text.lower():
-            return keyword
-    return ""
+    return get_default_parser().extract_major(doc)
 
 # --------------------------------------------------------------------------------
 
 # --------------------------------Extract languge-------------------------------
-from langdetect import detect
-from langdetect.lang_detect_exception import LangDetectException
-from langcodes import Language
 def detect_language_name(text):
-    try:
-        lang_code = detect(text)
-        return Language.get(lang_code).display_name()
-    except LangDetectException:
-        return "Unknown"
+    return get_default_parser().detect_language(text)
 
 def extract_languages_with_levels_from_pdf(pdf_path):
-    languages = []
-    known_levels = ["native", "fluent", "advanced", "intermediate", "basic", "beginner", "b1", "b2", "c1", "c2", "a1", "a2"]
-    known_languages = ["arabic", "english", "french", "german", "spanish"]
+    return extract_languages_with_levels(load_pdf(pdf_path))
 
-    full_text = ""
+def extract_languages_with_levels(pdf, sections=None):
+    return get_default_parser().extract_languages(pdf.text, sections)
 
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text()
-            if not text:
-                continue
-            full_text += "\n" + text  
-            lines = [line.strip() for line in text.splitlines() if line.strip()]
-            in_languages_section = False
-            
-            for line in lines:
-                if re.search(r'\blanguages\b', line, re.IGNORECASE):
-                    in_languages_section = True
-                    continue
+def languages_from_sections(sections):
+    return get_default_parser().language_table.from_sections(sections)
 
-                if in_languages_section:
-                    if re.search(r'\b(skills|experience|projects|certifications|education)\b', line, re.IGNORECASE):
-                        break
-
-                    lower_line = line.lower()
-                    for lang in known_languages:
-                        if lang in lower_line:
-                            level_found = None
-                            for lvl in known_levels:
-                                if lvl in lower_line:
-                                    level_found = lvl.capitalize()
-                                    break
-                            languages.append({
-                                "language": lang.capitalize(),
-                                "level": level_found or "Unknown"
-                            })
-
-    # ✅ في حال لم يتم العثور على أي لغة من القسم المحدد
-    if not languages:
-        lower_full_text = full_text.lower()
-        for lang in known_languages:
-            if lang in lower_full_text:
-                languages.append({
-                    "language": lang.capitalize(),
-                    "level": "Unknown"
-                })
-
-    return languages
+def languages_mentioned(text):
+    return get_default_parser().language_table.mentioned(text)
 # --------------------------------------------------------------------------------
 
 # --------------------------------Extract Experience-------------------------------
 
 def extract_experience(doc):
-    verbs = [token.text.lower() for token in doc if token.pos_ == 'VERB']
-
-    senior_keywords = ['lead', 'manage', 'direct', 'oversee', 'supervise', 'orchestrate', 'govern']
-    mid_senior_keywords = ['develop', 'design', 'analyze', 'implement', 'coordinate', 'execute', 'strategize']
-    mid_junior_keywords = ['assist', 'support', 'collaborate', 'participate', 'aid', 'facilitate', 'contribute']
-
-    if any(keyword in verbs for keyword in senior_keywords):
-        level_of_experience = "Senior"
-    elif any(keyword in verbs for keyword in mid_senior_keywords):
-        level_of_experience = "Mid-Senior"
-    elif any(keyword in verbs for keyword in mid_junior_keywords):
-        level_of_experience = "Mid-Junior"
-    else:
-        level_of_experience = "Entry Level"
-
-    suggested_position = suggest_position(verbs)
+    return get_default_parser().extract_experience(doc)
 
-    return {
-        'level_of_experience': level_of_experience,
-        'suggested_position': suggested_position
-    }
+def experience_verbs(doc):
+    return [token.text.lower() for token in doc if token.pos_ == 'VERB']
 # --------------------------------------------------------------------------------
-def extract_experiences(text):
-    experience_section_keywords = ['experience', 'work experience', 'professional experience']
+MONTH_PATTERN = (r'(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|'
+                 r'Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)')
+DATE_RANGE_RE = re.compile(rf'(\b{MONTH_PATTERN}[\s\-.,]?\d{{4}})\s*(?:-|to)?\s*'
+                           rf'(\b{MONTH_PATTERN}[\s\-.,]?\d{{4}}|present)?', re.IGNORECASE)
+
+def extract_experiences(text, sections=None):
+    if sections is None:
+        sections = segment_sections(text)
     experiences = []
 
-    lines = text.split('\n')
+    # each experience section runs until its first blank line
     experience_lines = []
-    collecting = False
-
-    for line in lines:
-        line_clean = line.strip().lower()
-        if any(keyword in line_clean for keyword in experience_section_keywords):
-            collecting = True
-            continue
-        if collecting:
-            if line.strip() == "" or line.lower().startswith("education") or line.lower().startswith("skills"):
-                break  
-            experience_lines.append(line.strip())
+    for section in sections.get('experience'):
+        for number in range(section.start_line, section.end_line):
+            line = sections.line_texts[number].strip()
+            if line == "":
+                break
+            experience_lines.append(line)
 
     current_exp = {}
     for line in experience_lines:
-        date_match = re.search(r'(\b(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|'
-                               r'May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|'
-                               r'Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[\s\-.,]?\d{4})\s*(?:-|to)?\s*'
-                               r'(\b(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|'
-                               r'May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|'
-                               r'Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[\s\-.,]?\d{4}|present)?', line, re.IGNORECASE)
+        date_match = DATE_RANGE_RE.search(line)
 
         if date_match:
             if current_exp:
@@ -275,30 +869,17 @@ def extract_experiences(text):
     return experiences
 
 # -----------------------------------Suggestions----------------------------------
-def load_positions_keywords(file_path):
-    positions_keywords = {}
-    with open(file_path, 'r', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            position = row['position']
-            keywords = [keyword.lower() for keyword in row['keywords'].split(',')]
-            positions_keywords[position] = keywords
-    return positions_keywords
-
 def suggest_position(verbs):
-    positions_keywords = load_positions_keywords('data/position.csv')
-    for position, keywords in positions_keywords.items():
-        if any(keyword in verbs for keyword in keywords):
-            return position
-    return "Position Not Identified"
+    return get_default_parser().suggest_position(verbs)
+
+def suggest_positions(docs, k=5):
+    return get_default_parser().rank_positions(docs, k=k)
 
 def extract_resume_info_from_pdf(file_path):
-    doc = fitz.open(file_path)
-    text = ""
-    for page_num in range(doc.page_count):
-        page = doc[page_num]
-        text += page.get_text()
-    return nlp(text)
+    import fitz  # PyMuPDF is only needed by this legacy helper
+    doc = fitz.open(stream=read_pdf_source(file_path), filetype='pdf')
+    text = "".join(page.get_text() for page in doc)
+    return get_default_parser().nlp(text)
 
 def extract_resume_info(doc):
     name = extract_name(doc)
@@ -309,7 +890,7 @@ def extract_resume_info(doc):
     degree_major = extract_major(doc)
     experience = extract_experience(doc)
     experiences = extract_experiences(doc.text)
-    language = extract_language(doc.text)  
+    language = detect_language_name(doc.text)
 
     return {
         'name': name,
@@ -323,65 +904,31 @@ def extract_resume_info(doc):
         'language': language,  
     }
 
-import pdfplumber
-def extract_from_pdf(pdf_path):
-    text = ""
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-    doc = nlp(text)
-
-    # Basic information extraction
-    name = extract_name(text)
-    email = extract_email(doc)
-    phone = extract_contact_number_from_resume(doc)
-    education = extract_education_from_resume(doc)
-    skills = extract_skills(doc)
-    major = extract_major(doc)
-    experience_info = extract_experience(doc)
-    languages = extract_languages_with_levels_from_pdf(pdf_path)
-    links = extract_links_from_pdf(pdf_path)
-    classified_links = classify_links(links)
-
-    # Compose final result dictionary
-    result = {
-        "name": name,
-        "email": email,
-        "phone": phone,
-        "education": education,
-        "skills": skills,
-        "major": major,
-        "experience_level": experience_info.get('level_of_experience'),
-        "suggested_position": experience_info.get('suggested_position'),
-        "languages": languages,
-        "links": classified_links
-    }
-
-    return result
-
-# ----------------------------------Example Usage-------------------------------
-result = extract_from_pdf("data/Safa_Abou_zaid.pdf")
-print(result)
+def extract_from_pdf(pdf_path, fields=None):
+    return get_default_parser().parse(pdf_path, fields=fields)
 
+def recommend_skill_gaps(skills, k=5):
+    return get_default_parser().gap_recommender.recommend(skills, k=k)
 
+def extract_from_pdf_stream(pdf_path, fields=None, max_pages=None, max_chars=None):
+    return get_default_parser().parse_stream(pdf_path, fields=fields, max_pages=max_pages, max_chars=max_chars)
 
-import pdfplumber
+def extract_from_pdfs(pdf_paths, batch_size=32, n_process=1, fields=None):
+    return get_default_parser().parse_many(pdf_paths, batch_size=batch_size, n_process=n_process, fields=fields)
 
 def extract_text_from_pdf(pdf_path):
-    text = ""
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            text += page.extract_text()
-    return text
-
-pdf_path = "data/Safa_Abou_zaid.pdf"
-text = extract_text_from_pdf(pdf_path)
+    return load_pdf(pdf_path).text
 
-
-print("="*40)
-print("PDF TEXT CONTENT:")
-print("="*40)
-print(text)
-print("="*40)
\ No newline at end of file
+# ----------------------------------Example Usage-------------------------------
+if __name__ == '__main__':
+    pdf_path = os.path.join(DATA_DIR, "Safa_Abou_zaid.pdf")
+    result = extract_from_pdf(pdf_path)
+    print(result)
+
+    text = extract_text_from_pdf(pdf_path)
+
+    print("="*40)
+    print("PDF TEXT CONTENT:")
+    print("="*40)
+    print(text)
+    print("="*40)
@@ -0,0 +1,41 @@
+import os
+import pickle
+from result_cache import model_fingerprint
+
+# bumped whenever the layout of the stored tables changes
+ARTIFACTS_VERSION = 2
+ARTIFACTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'artifacts.bin')
+MAGIC = b'RESUMEPARSER-ARTIFACTS'
+
+# ----------------------------------Artifact Bundle-------------------------------
+# every keyword table the parser compiles from the CSVs (tokenized skill patterns, the position index with
+# its lemma forms, the skill-gap matrix, the language tables) pickled into one file behind a
+# "<magic> <version> <fingerprint>" line; a bundle for other CSVs or another tokenizer is never used
+
+def bundle_fingerprint(nlp, files):
+    # the patterns depend on the tokenizer, and the position terms on whether there is a lemmatizer
+    return model_fingerprint(nlp, files, extra=(ARTIFACTS_VERSION, 'lemmatizer' in nlp.pipe_names))
+
+def read_bundle(path, fingerprint):
+    """The stored tables, or None when the file is missing, damaged or built for something else."""
+    try:
+        with open(path, 'rb') as file:
+            data = file.read()
+    except FileNotFoundError:
+        return None
+    header, _, payload = data.partition(b'\n')
+    if header != b' '.join([MAGIC, str(ARTIFACTS_VERSION).encode('ascii'), fingerprint.encode('ascii')]):
+        return None
+    try:
+        return pickle.loads(payload)
+    except Exception:
+        return None
+
+def write_bundle(path, fingerprint, tables):
+    # written next to the target and renamed, so a worker starting meanwhile never reads half a file
+    header = b' '.join([MAGIC, str(ARTIFACTS_VERSION).encode('ascii'), fingerprint.encode('ascii')])
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as file:
+        file.write(header + b'\n' + pickle.dumps(tables, protocol=pickle.HIGHEST_PROTOCOL))
+    os.replace(temp_path, path)
+# --------------------------------------------------------------------------------
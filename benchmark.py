@@ -0,0 +1,263 @@
+import os
+import sys
+import json
+import time
+import random
+import resource
+
+from pdf_ingest import load_pdf
+from skills_gazetteer import load_skill_keywords
+
+BENCH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'bench')
+
+FIRST_NAMES = ['Sara', 'Omar', 'Lina', 'Karim', 'Maya', 'Yousef', 'Nour', 'Adam', 'Hala', 'Rami', 'Emma', 'Lucas']
+LAST_NAMES = ['Haddad', 'Khalil', 'Nasser', 'Saleh', 'Mansour', 'Smith', 'Garcia', 'Muller', 'Rossi', 'Dubois']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Stark Industries', 'Wayne Tech', 'Hooli']
+UNIVERSITIES = ['Damascus University', 'Aleppo University', 'Stanford University', 'Imperial College',
+                'Massachusetts Institute of Technology']
+LANGUAGES = ['Arabic', 'English', 'French', 'German', 'Spanish']
+LEVELS = ['Native', 'Fluent', 'Advanced', 'Intermediate', 'Basic', 'B2', 'C1']
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+LAYOUTS = ('single', 'two_column', 'sidebar')
+
+# ----------------------------------Synthetic Corpus------------------------------
+def load_vocabulary(data_dir):
+    skills = load_skill_keywords([os.path.join(data_dir, 'newSkills.csv')])
+    with open(os.path.join(data_dir, 'majors.csv'), encoding='utf-8') as file:
+        majors = [line.split(',')[0] for line in file.read().splitlines()[1:] if line]
+    verbs = ['developed', 'designed', 'led', 'managed', 'implemented', 'analyzed', 'supported', 'built',
+             'deployed', 'tested', 'coordinated', 'maintained', 'optimized', 'documented']
+    return skills, majors, verbs
+
+def _sentence(rng, skills, verbs, skill_density):
+    words = [rng.choice(verbs).capitalize(), rng.choice(['a', 'the', 'several']),
+             rng.choice(['service', 'platform', 'pipeline', 'dashboard', 'application', 'report'])]
+    while rng.random() < skill_density:
+        words += [rng.choice(['using', 'with', 'in', 'and']), rng.choice(skills)]
+    words += [rng.choice(['for', 'across']), rng.choice(['customers', 'teams', 'the company', 'partners'])]
+    return ' '.join(words) + '.'
+
+def synthetic_resume(rng, vocabulary, pages=1, skill_density=0.3):
+    skills, majors, verbs = vocabulary
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    header = [f"{first} {last}",
+              f"{first.lower()}.{last.lower()}@example.com",
+              f"+963 {rng.randint(100, 999)} {rng.randint(100, 999)} {rng.randint(1000, 9999)}"]
+    links = [f"https://www.linkedin.com/in/{first.lower()}-{last.lower()}",
+             f"https://github.com/{first.lower()}{last.lower()}"]
+
+    side = ["Skills"] + rng.sample(skills, min(len(skills), 4 + int(skill_density * 20)))
+    side += ["Languages"] + [f"{language} - {rng.choice(LEVELS)}" for language in rng.sample(LANGUAGES, 2)]
+
+    main = ["Education", f"Bachelor of Science in {rng.choice(majors).title()}", rng.choice(UNIVERSITIES),
+            "Experience"]
+    # roughly 45 lines of content per page
+    while len(main) + len(side) + len(header) < pages * 45:
+        year = rng.randint(2005, 2022)
+        main.append(f"{rng.choice(['Software Engineer', 'Data Analyst', 'Project Manager'])} at {rng.choice(COMPANIES)}")
+        main.append(f"{rng.choice(MONTHS)} {year} - {rng.choice(MONTHS)} {year + rng.randint(1, 3)}")
+        main += [_sentence(rng, skills, verbs, skill_density) for _ in range(rng.randint(2, 5))]
+    return header, main, side, links
+
+def render_pdf(resume, layout, pages):
+    import fitz  # PyMuPDF is only needed to write the corpus
+    header, main, side, links = resume
+    doc = fitz.open()
+    width, height, margin = 595, 842, 40
+    per_page = max(1, (len(main) + len(side)) // pages + 1)
+
+    if layout == 'single':
+        chunks = [main[i:i + per_page] for i in range(0, len(main), per_page)]
+        chunks[-1] = chunks[-1] + side
+        columns = [[(fitz.Rect(margin, margin, width - margin, height - margin), chunk)] for chunk in chunks]
+    else:
+        split = 0.5 if layout == 'two_column' else 0.3
+        left = fitz.Rect(margin, margin, margin + (width - 2 * margin) * split - 10, height - margin)
+        right = fitz.Rect(left.x1 + 20, margin, width - margin, height - margin)
+        chunks = [main[i:i + per_page] for i in range(0, len(main), per_page)]
+        columns = [[(right, chunk)] for chunk in chunks]
+        columns[0].insert(0, (left, side))
+
+    for page_number, boxes in enumerate(columns):
+        page = doc.new_page(width=width, height=height)
+        if page_number == 0:
+            page.insert_textbox(fitz.Rect(margin, 10, width - margin, margin), '   '.join(header), fontsize=9)
+            for i, uri in enumerate(links):
+                rect = fitz.Rect(width - margin - 120, 10 + i * 12, width - margin, 22 + i * 12)
+                page.insert_text(rect.tl + (0, 10), uri.split('/')[2], fontsize=8)
+                page.insert_link({'kind': fitz.LINK_URI, 'from': rect, 'uri': uri})
+        for rect, lines in boxes:
+            page.insert_textbox(rect, '\n'.join(lines), fontsize=9)
+    return doc.tobytes()
+
+def generate_corpus(out_dir, count=50, seed=0, data_dir=None):
+    # the same seed always gives the same files, so numbers are comparable across runs
+    data_dir = data_dir or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+    vocabulary = load_vocabulary(data_dir)
+    rng = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for i in range(count):
+        pages = rng.choice([1, 1, 1, 2, 2, 3, 5, 10])
+        skill_density = rng.choice([0.05, 0.2, 0.4, 0.6])
+        layout = rng.choice(LAYOUTS)
+        path = os.path.join(out_dir, f"resume_{seed}_{i:05d}_{layout}_{pages}p.pdf")
+        if not os.path.exists(path):
+            data = render_pdf(synthetic_resume(rng, vocabulary, pages, skill_density), layout, pages)
+            with open(path, 'wb') as file:
+                file.write(data)
+        else:
+            # keep the generator in step so later files do not depend on which ones already exist
+            synthetic_resume(rng, vocabulary, pages, skill_density)
+        paths.append(path)
+    return paths
+# --------------------------------------------------------------------------------
+
+# ----------------------------------Stage Timing----------------------------------
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+def peak_rss_mb():
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+def time_stages(parser, data):
+    from app import classify_links
+    timings = {}
+
+    def timed(stage, func, *args):
+        started = time.perf_counter()
+        value = func(*args)
+        timings[stage] = time.perf_counter() - started
+        return value
+
+    pdf = timed('pdf_text', load_pdf, data)
+    doc = timed('nlp', parser.nlp, pdf.text)
+    timed('extract_name', parser.extract_name, doc)
+    timed('csv_skills', parser.csv_skills, doc)
+    timed('extract_skills_from_ner', parser.extract_skills_from_ner, doc)
+    timed('languages', parser.extract_languages, pdf.text)
+    timed('links', classify_links, pdf.links)
+    timed('experience', parser.extract_experience, doc)
+    timed('total', parser.parse, data)
+    return timings
+
+def run_benchmark(parser, paths, warmup=2):
+    datas = []
+    for path in paths:
+        with open(path, 'rb') as file:
+            datas.append(file.read())
+    # every timed stage runs once first, so lazily loaded pieces (the skills model, langdetect) are not in the samples
+    for data in datas[:warmup]:
+        time_stages(parser, data)
+
+    samples = {}
+    started = time.perf_counter()
+    for data in datas:
+        for stage, seconds in time_stages(parser, data).items():
+            samples.setdefault(stage, []).append(seconds)
+    elapsed = time.perf_counter() - started
+
+    total = sum(samples.get('total', []))
+    return {
+        'docs': len(datas),
+        'docs_per_sec': len(datas) / total if total else 0.0,
+        'wall_seconds': elapsed,
+        'peak_rss_mb': peak_rss_mb(),
+        'stages': {
+            stage: {'p50_ms': percentile(values, 50) * 1000,
+                    'p95_ms': percentile(values, 95) * 1000,
+                    'p99_ms': percentile(values, 99) * 1000,
+                    'mean_ms': sum(values) / len(values) * 1000}
+            for stage, values in samples.items()
+        },
+    }
+
+def compare_to_baseline(report, baseline, tolerance=0.25):
+    # a stage regresses when its p95 grows by more than `tolerance` over the stored baseline
+    regressions = []
+    for stage, stats in report['stages'].items():
+        base = baseline.get('stages', {}).get(stage)
+        if base and stats['p95_ms'] > base['p95_ms'] * (1 + tolerance):
+            regressions.append((stage, base['p95_ms'], stats['p95_ms']))
+    return regressions
+
+def print_report(report, stream=sys.stdout):
+    print(f"{report['docs']} docs, {report['docs_per_sec']:.2f} docs/sec, "
+          f"peak RSS {report['peak_rss_mb']:.0f} MB", file=stream)
+    print(f"{'stage':<26}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}", file=stream)
+    for stage, stats in report['stages'].items():
+        print(f"{stage:<26}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}", file=stream)
+
+# ----------------------------------Cold Start------------------------------------
+def memory_mb():
+    # (rss, pss) of this process; pss charges pages shared with other processes in equal parts, so for a
+    # forked worker it is what that worker really adds
+    values = {}
+    with open('/proc/self/smaps_rollup', 'r') as file:
+        for line in file:
+            key, _, rest = line.partition(':')
+            if key in ('Rss', 'Pss'):
+                values[key] = int(rest.split()[0]) / 1024.0
+    return values.get('Rss', 0.0), values.get('Pss', 0.0)
+
+def _first_parse(data):
+    from resumeparser import _parse_file
+    _parse_file(data)
+    rss, pss = memory_mb()
+    return os.getpid(), time.perf_counter(), rss, pss
+
+def cold_start(data, workers=4, prefork=False, artifacts_path=None):
+    """Seconds from creating a worker pool until its first and its last worker finished a parse, and memory."""
+    from resumeparser import worker_pool
+    started = time.perf_counter()
+    with worker_pool(workers, artifacts_path=artifacts_path, prefork=prefork) as pool:
+        # every worker is busy loading (or already warm) when the tasks arrive, so each takes one
+        results = [future.result() for future in [pool.submit(_first_parse, data) for _ in range(workers)]]
+    finished = sorted(done for _, done, _, _ in results)
+    return {
+        'workers': len({pid for pid, _, _, _ in results}),
+        'prefork': prefork,
+        'first_parse_seconds': finished[0] - started,
+        'all_workers_seconds': finished[-1] - started,
+        'parent_rss_mb': memory_mb()[0],
+        'worker_rss_mb': [rss for _, _, rss, _ in results],
+        'worker_pss_mb': [pss for _, _, _, pss in results],
+    }
+
+def print_cold_start(report, stream=sys.stdout):
+    print(f"{report['workers']} workers ({'prefork' if report['prefork'] else 'each loads its own models'}): "
+          f"first parse after {report['first_parse_seconds']:.2f}s, "
+          f"every worker after {report['all_workers_seconds']:.2f}s", file=stream)
+    rss, pss = report['worker_rss_mb'], report['worker_pss_mb']
+    print(f"per worker: RSS {sum(rss) / len(rss):.0f} MB, PSS {sum(pss) / len(pss):.0f} MB; "
+          f"parent RSS {report['parent_rss_mb']:.0f} MB", file=stream)
+# --------------------------------------------------------------------------------
+
+def main(args):
+    from app import ResumeParser
+    paths = generate_corpus(args.corpus_dir or BENCH_DIR, count=args.docs, seed=args.seed)
+    if args.cold_start:
+        with open(paths[0], 'rb') as file:
+            print_cold_start(cold_start(file.read(), workers=args.workers, prefork=args.prefork,
+                                        artifacts_path=args.artifacts))
+        return 0
+    report = run_benchmark(ResumeParser(), paths)
+    print_report(report)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            regressions = compare_to_baseline(report, json.load(file), args.tolerance)
+        for stage, before, after in regressions:
+            print(f"REGRESSION {stage}: p95 {before:.2f} ms -> {after:.2f} ms", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+# --------------------------------------------------------------------------------
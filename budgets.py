@@ -0,0 +1,127 @@
+import time
+import signal
+import threading
+from contextlib import nullcontext
+
+# ----------------------------------Stage Budgets---------------------------------
+class StageTimeout(BaseException):
+    # a BaseException so that the extractors' own `except Exception` handlers cannot swallow it
+    pass
+
+class Budget:
+    """Time limits for parsing one document: a total and optional per-stage caps, in seconds.
+
+    `stages` maps a stage name ('pdf', 'nlp', 'skills', ...) to its own limit;
+    `stage_seconds` applies to every stage not listed there. A stage never
+    gets more than what is left of the total.
+    """
+
+    def __init__(self, total_seconds=None, stage_seconds=None, stages=None):
+        self.total_seconds = total_seconds
+        self.stage_seconds = stage_seconds
+        self.stages = dict(stages or {})
+
+    def limit_for(self, name):
+        return self.stages.get(name, self.stage_seconds)
+
+    def start(self):
+        return CallBudget(self)
+
+class CallBudget:
+    """The clock of one parse and the stages that ran out of it.
+
+    In the main thread a stage is interrupted with SIGALRM once its time is
+    up; anywhere else it runs to the end and is only recorded as over budget.
+    Either way, once the total is spent every further stage is skipped.
+    `timed_out` lists the stages that were interrupted or skipped (their
+    fields are missing), `over_budget` those that finished late.
+    """
+
+    __slots__ = ('budget', 'deadline', 'timed_out', 'over_budget')
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.deadline = time.monotonic() + budget.total_seconds if budget.total_seconds is not None else None
+        self.timed_out = []
+        self.over_budget = []
+
+    def remaining(self, name):
+        limits = [self.budget.limit_for(name)]
+        if self.deadline is not None:
+            limits.append(self.deadline - time.monotonic())
+        limits = [limit for limit in limits if limit is not None]
+        return min(limits) if limits else None
+
+    def restart(self):
+        # batched parses restart the clock when they come back to a document, so it is not charged
+        # for the time spent on the other documents of its batch
+        if self.budget.total_seconds is not None:
+            self.deadline = time.monotonic() + self.budget.total_seconds
+
+    def allows(self, name):
+        # False (and recorded) when the document's total is already spent
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self.timed_out.append(name)
+            return False
+        return True
+
+    def limit(self, name, interrupt=True):
+        seconds = self.remaining(name)
+        if seconds is None:
+            return nullcontext()
+        return _StageLimit(self, name, seconds, interrupt)
+
+class _StageLimit:
+    __slots__ = ('call', 'name', 'seconds', 'interrupt', 'armed', 'started', 'previous')
+
+    def __init__(self, call, name, seconds, interrupt):
+        self.call = call
+        self.name = name
+        self.seconds = seconds
+        self.interrupt = interrupt and threading.current_thread() is threading.main_thread()
+        self.armed = False
+
+    def _expire(self, signum, frame):
+        if self.armed:
+            self.armed = False
+            raise StageTimeout(self.name)
+
+    def __enter__(self):
+        self.started = time.monotonic()
+        if self.interrupt:
+            self.previous = signal.signal(signal.SIGALRM, self._expire)
+            self.armed = True
+            # setitimer treats 0 as "disarm", so a stage that starts with no time left gets a millisecond
+            signal.setitimer(signal.ITIMER_REAL, max(self.seconds, 0.001))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.armed = False
+        if self.interrupt:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self.previous)
+        if exc_type is StageTimeout:
+            self.call.timed_out.append(self.name)
+        elif time.monotonic() - self.started > self.seconds:
+            self.call.over_budget.append(self.name)
+        # the timeout ends this stage only; the parse carries on with the next one
+        return exc_type is StageTimeout
+
+class _NoBudget:
+    # stands in for CallBudget when no budget is configured
+    __slots__ = ()
+    timed_out = ()
+    over_budget = ()
+    _no_limit = nullcontext()
+
+    def restart(self):
+        pass
+
+    def allows(self, name):
+        return True
+
+    def limit(self, name, interrupt=True):
+        return self._no_limit
+
+NO_BUDGET = _NoBudget()
+# --------------------------------------------------------------------------------
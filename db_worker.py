@@ -0,0 +1,138 @@
+import os
+import json
+import time
+import socket
+import sqlite3
+
+UPLOADS_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'user_pdfs.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pdf_parse_status (
+    pdf_id INTEGER PRIMARY KEY REFERENCES user_uploaded_pdfs (id),
+    status TEXT NOT NULL,
+    worker TEXT,
+    claimed_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS pdf_parse_status_status ON pdf_parse_status (status, claimed_at);
+-- every upload gets a 'pending' row as it is inserted, so claiming is an index range scan, not an anti-join
+CREATE TRIGGER IF NOT EXISTS pdf_parse_status_pending AFTER INSERT ON user_uploaded_pdfs BEGIN
+    INSERT OR REPLACE INTO pdf_parse_status (pdf_id, status) VALUES (NEW.id, 'pending');
+END;
+-- uploads from before the trigger existed
+INSERT OR IGNORE INTO pdf_parse_status (pdf_id, status) SELECT id, 'pending' FROM user_uploaded_pdfs;
+CREATE TABLE IF NOT EXISTS pdf_parse_results (
+    pdf_id INTEGER PRIMARY KEY REFERENCES user_uploaded_pdfs (id),
+    result TEXT,
+    error TEXT,
+    parsed_at REAL NOT NULL
+);
+"""
+
+# ----------------------------------Uploads Worker--------------------------------
+class UploadsWorker:
+    """Parses rows of user_uploaded_pdfs that no worker has handled yet.
+
+    Progress lives in pdf_parse_status next to the uploads table; a trigger
+    adds a 'pending' row for every upload. Rows are claimed inside a write
+    transaction, so several workers can share one database without taking the
+    same row; a claim older than lease_seconds is treated as abandoned and
+    handed out again.
+    """
+
+    def __init__(self, parser, db_path=UPLOADS_DB_PATH, batch_size=16, lease_seconds=600, max_attempts=3):
+        self.parser = parser
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        # autocommit mode; transactions are opened explicitly with BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self.conn.executescript(SCHEMA)
+
+    def claim(self):
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.give_up(now)
+            # abandoned claims first, then new uploads; both are range scans of the (status, claimed_at) index
+            pdf_ids = [pdf_id for (pdf_id,) in self.conn.execute("""
+                SELECT pdf_id FROM pdf_parse_status
+                WHERE status = 'claimed' AND claimed_at < ? AND attempts < ?
+                LIMIT ?""", (now - self.lease_seconds, self.max_attempts, self.batch_size))]
+            # a pending row has never been claimed; with claimed_at pinned too the index yields them in id order
+            pdf_ids += [pdf_id for (pdf_id,) in self.conn.execute("""
+                SELECT pdf_id FROM pdf_parse_status WHERE status = 'pending' AND claimed_at IS NULL
+                ORDER BY pdf_id LIMIT ?""", (self.batch_size - len(pdf_ids),))]
+            self.conn.executemany("""
+                UPDATE pdf_parse_status SET status = 'claimed', worker = ?, claimed_at = ?, attempts = attempts + 1
+                WHERE pdf_id = ?""", [(self.worker_id, now, pdf_id) for pdf_id in pdf_ids])
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return pdf_ids
+
+    def give_up(self, now):
+        # a row whose lease ran out max_attempts times keeps killing its worker; record it as failed
+        rows = self.conn.execute("""
+            SELECT pdf_id, attempts FROM pdf_parse_status
+            WHERE status = 'claimed' AND claimed_at < ? AND attempts >= ?""",
+            (now - self.lease_seconds, self.max_attempts)).fetchall()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO pdf_parse_results (pdf_id, result, error, parsed_at) VALUES (?, NULL, ?, ?)",
+            [(pdf_id, f"gave up after {attempts} attempts", now) for pdf_id, attempts in rows])
+        self.conn.executemany(
+            "UPDATE pdf_parse_status SET status = 'failed' WHERE pdf_id = ?", [(pdf_id,) for pdf_id, _ in rows])
+        return len(rows)
+
+    def iter_blobs(self, pdf_ids):
+        # blobs go straight to the parser as bytes; nothing is written to disk
+        for pdf_id in pdf_ids:
+            row = self.conn.execute("SELECT data FROM user_uploaded_pdfs WHERE id = ?", (pdf_id,)).fetchone()
+            yield pdf_id, bytes(row[0]) if row else b""
+
+    def process_batch(self):
+        pdf_ids = self.claim()
+        if not pdf_ids:
+            return 0
+
+        blobs = list(self.iter_blobs(pdf_ids))
+        rows = []
+        statuses = []
+        now = time.time()
+        for (pdf_id, _), batch_result in zip(blobs, self.parser.parse_many(data for _, data in blobs)):
+            if batch_result.error is None:
+                rows.append((pdf_id, json.dumps(batch_result.result, ensure_ascii=False), None, now))
+                statuses.append(('done', pdf_id))
+            else:
+                rows.append((pdf_id, None, f"{type(batch_result.error).__name__}: {batch_result.error}", now))
+                statuses.append(('failed', pdf_id))
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO pdf_parse_results (pdf_id, result, error, parsed_at) VALUES (?, ?, ?, ?)",
+                rows)
+            self.conn.executemany(
+                "UPDATE pdf_parse_status SET status = ? WHERE pdf_id = ?", statuses)
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return len(pdf_ids)
+
+    def run(self, once=False, poll_seconds=5.0):
+        processed = 0
+        while True:
+            count = self.process_batch()
+            processed += count
+            if count == 0:
+                if once:
+                    return processed
+                time.sleep(poll_seconds)
+
+    def close(self):
+        self.conn.close()
+# --------------------------------------------------------------------------------
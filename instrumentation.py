@@ -0,0 +1,182 @@
+import os
+import time
+import logging
+import cProfile
+import threading
+from contextlib import contextmanager, nullcontext
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------------Per-call Metrics------------------------------
+class CallMetrics:
+    """Wall and CPU time per stage plus counters for a single parse.
+
+    With profile=True, the code run inside profiled() is also recorded by
+    cProfile; the stats are left in `profiler` for the on_slow hook.
+    """
+
+    __slots__ = ('stages', 'counters', 'profile', 'profiler')
+
+    def __init__(self, profile=False):
+        self.stages = {}
+        self.counters = {}
+        self.profile = profile
+        self.profiler = None
+
+    def stage(self, name):
+        return _StageTimer(self, name)
+
+    @contextmanager
+    def profiled(self):
+        if not self.profile:
+            yield
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # another profiler is already active (Python 3.12+ allows one at a time); go without
+            yield
+            return
+        try:
+            yield
+        finally:
+            profiler.disable()
+            self.profiler = profiler
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    @property
+    def wall_seconds(self):
+        return sum(wall for wall, _ in self.stages.values())
+
+    def as_dict(self):
+        return {
+            'stages': {name: {'wall_ms': wall * 1000, 'cpu_ms': cpu * 1000}
+                       for name, (wall, cpu) in self.stages.items()},
+            'counters': dict(self.counters),
+        }
+
+class _StageTimer:
+    __slots__ = ('metrics', 'name', 'wall', 'cpu')
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc_info):
+        wall = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+        previous = self.metrics.stages.get(self.name)
+        if previous is not None:
+            wall, cpu = wall + previous[0], cpu + previous[1]
+        self.metrics.stages[self.name] = (wall, cpu)
+        return False
+
+class _NullMetrics:
+    # stands in for CallMetrics when instrumentation is off; every call is a no-op
+    __slots__ = ()
+    _null_stage = nullcontext()
+
+    def stage(self, name):
+        return self._null_stage
+
+    def profiled(self):
+        return self._null_stage
+
+    def count(self, name, value=1):
+        pass
+
+NULL_METRICS = _NullMetrics()
+# --------------------------------------------------------------------------------
+
+# ----------------------------------Aggregation-----------------------------------
+class Instrumentation:
+    """Aggregates CallMetrics across parses and exports them as JSON or Prometheus text.
+
+    on_slow(parser, source, metrics) is called for every parse whose total
+    stage time exceeds slow_threshold seconds; see cprofile_hook(). An error
+    in the hook is logged, never raised into the parse.
+    """
+
+    def __init__(self, slow_threshold=None, on_slow=None, profile=False):
+        self.slow_threshold = slow_threshold
+        self.on_slow = on_slow
+        # run parse() and parse_stream() under cProfile, so a slow call's profile is there for on_slow
+        self.profile = profile
+        self.documents = 0
+        self.stages = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def new_call(self):
+        return CallMetrics(self.profile)
+
+    def record(self, metrics, parser=None, source=None):
+        with self._lock:
+            self.documents += 1
+            for name, (wall, cpu) in metrics.stages.items():
+                total = self.stages.setdefault(name, [0, 0.0, 0.0])
+                total[0] += 1
+                total[1] += wall
+                total[2] += cpu
+            for name, value in metrics.counters.items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+        if self.on_slow is not None and self.slow_threshold is not None \
+                and metrics.wall_seconds > self.slow_threshold:
+            try:
+                self.on_slow(parser, source, metrics)
+            except Exception:
+                logger.exception("on_slow hook failed")
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'documents': self.documents,
+                'stages': {name: {'calls': calls, 'wall_seconds': wall, 'cpu_seconds': cpu}
+                           for name, (calls, wall, cpu) in self.stages.items()},
+                'counters': dict(self.counters),
+            }
+
+    def prometheus(self, prefix='resumeparser'):
+        snapshot = self.snapshot()
+        lines = [f"# TYPE {prefix}_documents_total counter",
+                 f"{prefix}_documents_total {snapshot['documents']}",
+                 f"# TYPE {prefix}_stage_calls_total counter"]
+        for name, stats in snapshot['stages'].items():
+            lines.append(f'{prefix}_stage_calls_total{{stage="{name}"}} {stats["calls"]}')
+        lines.append(f"# TYPE {prefix}_stage_seconds_total counter")
+        for name, stats in snapshot['stages'].items():
+            lines.append(f'{prefix}_stage_seconds_total{{stage="{name}",clock="wall"}} {stats["wall_seconds"]:.6f}')
+            lines.append(f'{prefix}_stage_seconds_total{{stage="{name}",clock="cpu"}} {stats["cpu_seconds"]:.6f}')
+        for name, value in snapshot['counters'].items():
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {value}")
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            self.documents = 0
+            self.stages = {}
+            self.counters = {}
+
+def cprofile_hook(out_dir):
+    # writes the cProfile stats of a slow parse to out_dir; needs Instrumentation(profile=True)
+    os.makedirs(out_dir, exist_ok=True)
+
+    def capture(parser, source, metrics):
+        # the profile of the call that was slow, not of a re-run (which would only find it in the cache)
+        if getattr(metrics, 'profiler', None) is None:
+            return
+        name = os.path.basename(source) if isinstance(source, str) else f"doc-{id(source):x}"
+        metrics.profiler.dump_stats(os.path.join(out_dir, f"{int(time.time() * 1000)}-{name}.prof"))
+
+    return capture
+# --------------------------------------------------------------------------------
@@ -0,0 +1,157 @@
+import os
+import re
+import csv
+from collections import namedtuple
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+LANGUAGES_CSV_PATH = os.path.join(DATA_DIR, 'languages.csv')
+LANGUAGE_LEVELS_CSV_PATH = os.path.join(DATA_DIR, 'languageLevels.csv')
+
+# language detection only ever looks at this many characters of a resume
+DETECT_SAMPLE_CHARS = 2000
+
+LanguageEntry = namedtuple('LanguageEntry', ['name', 'code'])
+LevelEntry = namedtuple('LevelEntry', ['name', 'cefr'])
+
+def load_table(file_path, entry_type):
+    # one entry per row; the name is always an alias and the `aliases` column adds ';'-separated ones
+    entries, aliases = [], {}
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for row in csv.DictReader(file):
+            if not (row.get('name') or '').strip():
+                continue
+            entry = entry_type(*((row.get(field) or '').strip() for field in entry_type._fields))
+            entries.append(entry)
+            for alias in [entry.name, *(row.get('aliases') or '').split(';')]:
+                if alias.strip():
+                    aliases.setdefault(alias.strip().lower(), entry)
+    return entries, aliases
+
+CLAUSE_RE = re.compile(r'[,;|•·]')
+
+def alternation(aliases):
+    # longest first so "mother language" wins over a shorter alias starting the same way
+    return '|'.join(re.escape(alias) for alias in sorted(aliases, key=len, reverse=True))
+
+# ----------------------------------Language Table--------------------------------
+class LanguageTable:
+    """Languages and proficiency levels from data/languages.csv and data/languageLevels.csv.
+
+    Both lists are compiled into one word-boundary pattern, so a line is
+    scanned once whatever the size of the tables and "c1" or "english" only
+    match as whole words.
+    """
+
+    def __init__(self, languages_csv=LANGUAGES_CSV_PATH, levels_csv=LANGUAGE_LEVELS_CSV_PATH, state=None):
+        if state is None:
+            state = {'languages': load_table(languages_csv, LanguageEntry), 'levels': load_table(levels_csv, LevelEntry)}
+        self.languages, self.language_aliases = state['languages']
+        self.levels, self.level_aliases = state['levels']
+        self.codes = {entry.code.lower(): entry.name for entry in self.languages if entry.code}
+        self.order = {entry.name: position for position, entry in enumerate(self.languages)}
+        self.pattern = re.compile(
+            rf"(?<!\w)(?:(?P<language>{alternation(self.language_aliases)})|"
+            rf"(?P<level>{alternation(self.level_aliases)}))(?!\w)", re.IGNORECASE)
+
+    def state(self):
+        return {'languages': (self.languages, self.language_aliases), 'levels': (self.levels, self.level_aliases)}
+
+    @classmethod
+    def from_state(cls, state):
+        return cls(state=state)
+
+    def hits(self, text):
+        # ('language' | 'level', entry) in reading order
+        for match in self.pattern.finditer(text):
+            kind = match.lastgroup
+            aliases = self.language_aliases if kind == 'language' else self.level_aliases
+            yield kind, aliases[match.group(kind).lower()]
+
+    def pairs(self, text):
+        """Every language of text with its level.
+
+        Within a clause (text between commas, semicolons or bullets) a language
+        takes the level right after it, else the level right before it unless
+        the previous language already took that one.
+        """
+        return [found for clause in CLAUSE_RE.split(text) for found in self.clause_pairs(clause)]
+
+    def clause_pairs(self, clause):
+        hits = list(self.hits(clause))
+        found = []
+        claimed = -1
+        for index, (kind, entry) in enumerate(hits):
+            if kind != 'language':
+                continue
+            level_index = None
+            if index + 1 < len(hits) and hits[index + 1][0] == 'level':
+                level_index = index + 1
+            elif index > 0 and hits[index - 1][0] == 'level' and index - 1 > claimed:
+                level_index = index - 1
+            if level_index is not None:
+                claimed = level_index
+            found.append(self.entry(entry, hits[level_index][1] if level_index is not None else None))
+        return found
+
+    def entry(self, language, level=None):
+        return {"language": language.name,
+                "level": level.name if level else "Unknown",
+                "cefr": level.cefr if level else None}
+
+    def from_sections(self, sections):
+        # a languages section is read as one stream, so "Hindi" on one line pairs with "Native" on the next
+        return self.pairs('\n'.join(sections.lines('languages')))
+
+    def from_lines(self, text):
+        # outside a languages section a level only counts when it is on the same line as the language
+        return [found for line in text.splitlines() for found in self.pairs(line)]
+
+    def mentioned(self, text):
+        names = {entry.name for kind, entry in self.hits(text) if kind == 'language'}
+        return [self.entry(entry) for entry in self.languages if entry.name in names]
+
+    def merge(self, found):
+        # one entry per language, in table order; a known level beats "Unknown"
+        best = {}
+        for item in found:
+            if item['language'] not in best or best[item['language']]['level'] == "Unknown":
+                best[item['language']] = item
+        return sorted(best.values(), key=lambda item: self.order[item['language']])
+
+    def extract(self, text, sections):
+        """Languages section first; without one, any line naming a language."""
+        return self.merge(self.from_sections(sections)) or self.merge(self.from_lines(text))
+
+    def name_for_code(self, code):
+        if code.lower() in self.codes:
+            return self.codes[code.lower()]
+        from langcodes import Language
+        return Language.get(code).display_name()
+# --------------------------------------------------------------------------------
+
+# ----------------------------------Detection-------------------------------------
+class LanguageDetector:
+    """langdetect with its profiles loaded once and a fixed seed, so a text always gets the same answer."""
+
+    def __init__(self, seed=0, sample_chars=DETECT_SAMPLE_CHARS):
+        from langdetect import DetectorFactory
+        from langdetect.detector_factory import PROFILES_DIRECTORY
+        self.factory = DetectorFactory()
+        self.factory.load_profile(PROFILES_DIRECTORY)
+        self.factory.set_seed(seed)
+        self.sample_chars = sample_chars
+
+    def sample(self, text):
+        # collapse whitespace first so a layout full of blank lines does not eat the budget
+        return ' '.join(text[:self.sample_chars * 2].split())[:self.sample_chars]
+
+    def detect(self, text):
+        from langdetect.lang_detect_exception import LangDetectException
+        detector = self.factory.create()
+        detector.set_max_text_length(self.sample_chars)
+        detector.append(self.sample(text))
+        try:
+            return detector.detect()
+        except LangDetectException:
+            return None
+# --------------------------------------------------------------------------------
@@ -0,0 +1,141 @@
+import os
+import re
+import zlib
+import sqlite3
+import hashlib
+import threading
+import numpy as np
+
+# the permutations are (a * x + b) mod p over 32-bit shingle hashes x with a, b drawn below p; the product
+# wraps around in uint64, which only mixes the values further
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+
+TOKEN_RE = re.compile(r'\w+')
+DIGITS_RE = re.compile(r'\d+')
+
+def normalize_text(text):
+    # case, punctuation, layout and digits (dates, phone numbers, years) do not make two resumes different
+    return TOKEN_RE.findall(DIGITS_RE.sub('0', text.lower()))
+
+def shingle_hashes(tokens, size):
+    # distinct 32-bit hashes of every run of `size` words; a text shorter than that is one shingle
+    size = max(min(size, len(tokens)), 1)
+    shingles = {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+    return np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles), dtype=np.uint64)
+
+# ----------------------------------Near Duplicates-------------------------------
+class NearDuplicateIndex:
+    """MinHash signatures of resume texts with an LSH bucket table, stored in SQLite.
+
+    A signature is num_perm minima over the text's word shingles; the share of
+    equal minima between two signatures estimates the Jaccard similarity of
+    the texts. Only the low 16 bits of every minimum are stored (b-bit
+    MinHash), 256 bytes per document at the default size. Candidates are found
+    through `bands` bucket rows per document, so a lookup reads a handful of
+    index entries however many signatures are stored.
+    """
+
+    def __init__(self, db_path, threshold=0.9, num_perm=128, bands=16, shingle_size=5, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.db_path = db_path
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+    def _connection(self):
+        # same rule as ResultCache: one connection per process
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS minhash_signatures (
+                    doc_id INTEGER PRIMARY KEY,
+                    pdf_hash TEXT NOT NULL UNIQUE,
+                    signature BLOB NOT NULL
+                )""")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS minhash_buckets (
+                    bucket INTEGER NOT NULL,
+                    doc_id INTEGER NOT NULL,
+                    PRIMARY KEY (bucket, doc_id)
+                ) WITHOUT ROWID""")
+            self._conn.commit()
+            self._pid = os.getpid()
+        return self._conn
+
+    def signature(self, text):
+        """uint32 MinHash signature of text, None when the text has no words."""
+        hashes = shingle_hashes(normalize_text(text), self.shingle_size)
+        if not len(hashes):
+            return None
+        permuted = (hashes[:, None] * self.a + self.b) % MERSENNE_PRIME
+        return (permuted.min(axis=0) & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+
+    def buckets(self, signature):
+        rows = self.num_perm // self.bands
+        return [int.from_bytes(hashlib.blake2b(bytes([band]) + signature[band * rows:(band + 1) * rows].tobytes(),
+                                               digest_size=8).digest(), 'little', signed=True)
+                for band in range(self.bands)]
+
+    @staticmethod
+    def compact(signature):
+        return (signature & 0xFFFF).astype('<u2')
+
+    def find(self, signature, max_candidates=50):
+        """(pdf_hash, similarity) of the most similar stored text at or above the threshold, else None."""
+        if signature is None:
+            return None
+        buckets = self.buckets(signature)
+        with self._lock:
+            conn = self._connection()
+            candidates = conn.execute(
+                f"SELECT doc_id, COUNT(*) AS shared FROM minhash_buckets WHERE bucket IN ({','.join('?' * len(buckets))}) "
+                "GROUP BY doc_id ORDER BY shared DESC LIMIT ?", (*buckets, max_candidates)).fetchall()
+            rows = conn.execute(
+                f"SELECT pdf_hash, signature FROM minhash_signatures WHERE doc_id IN ({','.join('?' * len(candidates))})",
+                [doc_id for doc_id, _ in candidates]).fetchall() if candidates else []
+        best = None
+        compact = self.compact(signature)
+        for pdf_hash, stored in rows:
+            similarity = float(np.mean(np.frombuffer(stored, dtype='<u2') == compact))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (pdf_hash, similarity)
+        if best is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return best
+
+    def add(self, pdf_hash, signature):
+        if signature is None:
+            return
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.execute("INSERT OR IGNORE INTO minhash_signatures (pdf_hash, signature) VALUES (?, ?)",
+                                  (pdf_hash, self.compact(signature).tobytes()))
+            if cursor.rowcount:
+                conn.executemany("INSERT OR IGNORE INTO minhash_buckets (bucket, doc_id) VALUES (?, ?)",
+                                 [(bucket, cursor.lastrowid) for bucket in self.buckets(signature)])
+            conn.commit()
+
+    def stats(self):
+        with self._lock:
+            entries = self._connection().execute("SELECT COUNT(*) FROM minhash_signatures").fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses, 'entries': entries, 'threshold': self.threshold}
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+# --------------------------------------------------------------------------------
@@ -0,0 +1,217 @@
+import os
+import json
+import uuid
+import queue
+import asyncio
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urlsplit, parse_qs
+
+from resumeparser import worker_pool, _parse_file
+
+REASONS = {200: 'OK', 202: 'Accepted', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           411: 'Length Required', 413: 'Payload Too Large', 429: 'Too Many Requests',
+           500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+def _ping():
+    return os.getpid()
+
+# ----------------------------------Parse Service---------------------------------
+class ParseService:
+    """Local HTTP front end that hands PDF uploads to pre-warmed worker processes.
+
+    POST /parse             body is the PDF; answers with the parse result
+    POST /jobs              body is the PDF; answers 202 with a job id
+    GET  /jobs/<id>         job status, with the result once it is done
+    GET  /health            readiness and queue depth; 503 while the workers start or after the pool broke
+
+    At most max_pending parses are queued or running at once; past that new
+    uploads get 429 instead of piling up behind the workers.
+    """
+
+    def __init__(self, workers=None, max_pending=None, max_body_bytes=20 * 1024 * 1024,
+                 max_jobs=10000, cache_path=None, artifacts_path=None, prefork=False):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 4
+        self.max_body_bytes = max_body_bytes
+        self.max_jobs = max_jobs
+        self.cache_path = cache_path
+        self.artifacts_path = artifacts_path
+        # load the models once in this process and fork the workers from it
+        self.prefork = prefork
+        self.pending = 0
+        self.ready = False
+        # set once a worker died and took the pool down; parses are refused from then on
+        self.broken = False
+        self.jobs = OrderedDict()
+        self.pool = None
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        ready = multiprocessing.Queue()
+        # the prefork warm-up loads the models in this process; off the loop, so /health answers meanwhile
+        self.pool = await loop.run_in_executor(None, worker_pool, self.workers, self.cache_path,
+                                               self.artifacts_path, self.prefork, ready)
+        # one task per worker makes the pool start them all; a warm worker can answer several pings,
+        # so readiness waits for every worker to report its own pid
+        pings = [loop.run_in_executor(self.pool, _ping) for _ in range(self.workers)]
+        pids = set()
+        while len(pids) < self.workers:
+            try:
+                pids.add(await loop.run_in_executor(None, ready.get, True, 1.0))
+            except queue.Empty:
+                failed = [ping for ping in pings if ping.done() and ping.exception() is not None]
+                if failed:
+                    self.broken = True
+                    raise failed[0].exception()
+        await asyncio.gather(*pings)
+        self.ready = True
+
+    def close(self):
+        self.ready = False
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    def _submit(self, data, fields):
+        future = asyncio.get_running_loop().run_in_executor(self.pool, _parse_file, data, fields)
+        self.pending += 1
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, future):
+        self.pending -= 1
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            self.broken = True
+
+    def _remember(self, job_id, future):
+        self.jobs[job_id] = future
+        while len(self.jobs) > self.max_jobs:
+            self.jobs.popitem(last=False)
+
+    # ----------------------------------Routing-----------------------------------
+    async def handle(self, method, path, query, body):
+        if path == '/health':
+            status = 'broken' if self.broken else 'ok' if self.ready else 'starting'
+            return 200 if status == 'ok' else 503, {
+                'status': status, 'workers': self.workers, 'pending': self.pending,
+                'max_pending': self.max_pending, 'jobs': len(self.jobs)}
+
+        if path.startswith('/jobs/'):
+            if method != 'GET':
+                return 405, {'error': 'use GET'}
+            future = self.jobs.get(path[len('/jobs/'):])
+            if future is None:
+                return 404, {'error': 'unknown job'}
+            if not future.done():
+                return 200, {'status': 'pending'}
+            if future.exception() is not None:
+                return 200, {'status': 'failed', 'error': str(future.exception())}
+            return 200, {'status': 'done', 'result': future.result()}
+
+        if path not in ('/parse', '/jobs'):
+            return 404, {'error': 'not found'}
+        if method != 'POST':
+            return 405, {'error': 'use POST'}
+        if self.broken:
+            return 503, {'error': 'the worker pool is broken'}
+        if not self.ready:
+            return 503, {'error': 'workers are still starting'}
+        if self.pending >= self.max_pending:
+            return 429, {'error': 'parse queue is full', 'pending': self.pending}
+        if not body:
+            return 400, {'error': 'empty body, send the PDF as the request body'}
+
+        fields = None
+        if 'fields' in query:
+            fields = {field for value in query['fields'] for field in value.split(',') if field}
+
+        try:
+            future = self._submit(body, fields)
+        except BrokenProcessPool:
+            self.broken = True
+            return 503, {'error': 'the worker pool is broken'}
+        if path == '/jobs':
+            job_id = uuid.uuid4().hex
+            self._remember(job_id, future)
+            return 202, {'job_id': job_id, 'status': 'pending'}
+        try:
+            return 200, await future
+        except ValueError as exc:
+            return 400, {'error': str(exc)}
+        except Exception as exc:
+            return 500, {'error': f"{type(exc).__name__}: {exc}"}
+
+    # ----------------------------------HTTP--------------------------------------
+    async def serve_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, 400, {'error': 'malformed request line'}, keep_alive=False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                body = b''
+                if method == 'POST':
+                    if 'content-length' not in headers:
+                        await self._respond(writer, 411, {'error': 'Content-Length required'}, keep_alive=False)
+                        break
+                    length = headers['content-length']
+                    if not (length.isascii() and length.isdigit()):
+                        await self._respond(writer, 400, {'error': 'invalid Content-Length'}, keep_alive=False)
+                        break
+                    length = int(length)
+                    if length > self.max_body_bytes:
+                        await self._respond(writer, 413, {'error': 'upload too large'}, keep_alive=False)
+                        break
+                    try:
+                        body = await reader.readexactly(length)
+                    except asyncio.IncompleteReadError:
+                        await self._respond(writer, 400, {'error': 'body shorter than Content-Length'},
+                                            keep_alive=False)
+                        break
+
+                url = urlsplit(target)
+                status, payload = await self.handle(method, url.path, parse_qs(url.query), body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n")
+        if status in (429, 503):
+            head += "Retry-After: 1\r\n"
+        writer.write(head.encode('latin-1') + b"\r\n" + body)
+        await writer.drain()
+# --------------------------------------------------------------------------------
+
+async def serve(host='127.0.0.1', port=8000, **service_options):
+    service = ParseService(**service_options)
+    server = await asyncio.start_server(service.serve_connection, host, port)
+    try:
+        await service.start()
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
@@ -0,0 +1,95 @@
+import io
+import os
+import pdfplumber
+from contextlib import nullcontext
+
+# ----------------------------------PDF Ingestion---------------------------------
+class ParsedPDF:
+    """Everything the extractors need from a PDF, read in a single pass."""
+
+    def __init__(self, page_texts, links, truncated=False):
+        self.page_texts = page_texts
+        self.pages = [[line.strip() for line in text.splitlines() if line.strip()] for text in page_texts]
+        self.links = links
+        self.text = "".join(text + "\n" for text in page_texts if text)
+        # True when a page or character cap stopped reading before the end of the document
+        self.truncated = truncated
+
+    @property
+    def page_count(self):
+        return len(self.page_texts)
+
+    def lines(self):
+        for page_lines in self.pages:
+            yield from page_lines
+
+def read_pdf_source(source):
+    # Normalise a path, raw bytes or an open binary buffer to bytes so the document is read exactly once
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if hasattr(source, 'read'):
+        return source.read()
+    with open(source, 'rb') as file:
+        return file.read()
+
+def open_pdf(source):
+    # paths are handed to pdfplumber as is so the file is read lazily instead of copied into memory
+    if isinstance(source, (str, os.PathLike)):
+        return pdfplumber.open(source)
+    return pdfplumber.open(io.BytesIO(read_pdf_source(source)))
+
+def _release(page):
+    # drop the page's parsed layout objects before moving on; older pdfplumber only has flush_cache
+    close = getattr(page, 'close', None) or getattr(page, 'flush_cache', None)
+    if close is not None:
+        close()
+
+def iter_pdf_pages(source, links=True, max_pages=None, max_chars=None):
+    """Yield a one-page ParsedPDF per page so only one page is held in memory at a time."""
+    if isinstance(source, ParsedPDF):
+        for number, text in enumerate(source.page_texts):
+            yield ParsedPDF([text], source.links if number == 0 else [])
+        return
+
+    chars = 0
+    with open_pdf(source) as pdf:
+        for number, page in enumerate(pdf.pages):
+            if max_pages is not None and number >= max_pages:
+                break
+            text = page.extract_text() or ""
+            truncated = max_chars is not None and chars + len(text) > max_chars
+            if truncated:
+                text = text[:max_chars - chars]
+            chars += len(text)
+
+            uris = []
+            if links:
+                for link in page.hyperlinks:
+                    uri = link.get("uri", None)
+                    if uri:
+                        uris.append(uri)
+            _release(page)
+
+            truncated = truncated or (max_pages is not None and number + 1 == max_pages < len(pdf.pages))
+            yield ParsedPDF([text], uris, truncated)
+            if truncated:
+                break
+
+def load_pdf(source, links=True, max_pages=None, max_chars=None, budget=None):
+    # links=False skips reading the link annotations when the caller has no use for them
+    if isinstance(source, ParsedPDF):
+        return source
+
+    page_texts = []
+    uris = []
+    truncated = False
+    finished = False
+    # a budgets.CallBudget can stop the reading between or inside pages; what was read so far is kept
+    with budget.limit('pdf') if budget is not None else nullcontext():
+        for page in iter_pdf_pages(source, links, max_pages, max_chars):
+            page_texts.extend(page.page_texts)
+            uris.extend(page.links)
+            truncated = page.truncated
+        finished = True
+    return ParsedPDF(page_texts, uris, truncated or not finished)
+# --------------------------------------------------------------------------------
@@ -0,0 +1,148 @@
+import os
+import csv
+import numpy as np
+from spacy.tokens import Doc
+from spacy.matcher import PhraseMatcher
+from skills_gazetteer import token_pattern
+
+POSITIONS_CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'position.csv')
+NO_POSITION = "Position Not Identified"
+
+def load_positions_keywords(file_path):
+    positions_keywords = {}
+    with open(file_path, 'r', encoding='utf-8') as file:
+        reader = csv.DictReader(file)
+        for row in reader:
+            position = row['position']
+            keywords = [keyword.strip().lower() for keyword in row['keywords'].split(',') if keyword.strip()]
+            positions_keywords[position] = keywords
+    return positions_keywords
+
+# ----------------------------------Position Scoring------------------------------
+class PositionScorer:
+    """Keyword -> positions index compiled once from position.csv.
+
+    A resume is reduced to the set of keyword ids it mentions (by lowercase
+    text or lemma), and every position is scored against that set with one
+    matrix product. A keyword shared by several positions weighs less than
+    one only a single position uses; a position's weights sum to 1, so its
+    score is the share of its keyword weight the resume covers.
+    """
+
+    def __init__(self, nlp, csv_path=POSITIONS_CSV_PATH, state=None):
+        if state is None:
+            state = self.compile(nlp, load_positions_keywords(csv_path))
+        self.positions_keywords = state['positions_keywords']
+        self.positions = list(self.positions_keywords)
+        self.keywords = state['keywords']
+        self.keyword_ids = {keyword: keyword_id for keyword_id, keyword in enumerate(self.keywords)}
+        self.term_ids = state['term_ids']
+        self.lemmas = state['lemmas']
+        self.phrase_patterns = state['phrase_patterns']
+        self.matrix = state['matrix']
+        self.phrase_matcher = PhraseMatcher(nlp.vocab, attr='LOWER')
+        self.phrase_ids = {}
+        for keyword, (words, spaces) in self.phrase_patterns.items():
+            self.phrase_matcher.add(keyword, [Doc(nlp.vocab, words=words, spaces=spaces)])
+            self.phrase_ids[nlp.vocab.strings[keyword]] = self.keyword_ids[keyword]
+
+    @staticmethod
+    def compile(nlp, positions_keywords, previous=None):
+        # everything derived from the CSV, as plain data an artifact bundle can store; the lemmas and phrase
+        # patterns of a previous state are reused, so a reload only runs the pipeline over new keywords
+        known_lemmas = previous['lemmas'] if previous else {}
+        known_phrases = previous['phrase_patterns'] if previous else {}
+        keywords, keyword_ids = [], {}
+        for position_keywords in positions_keywords.values():
+            for keyword in position_keywords:
+                if keyword not in keyword_ids:
+                    keyword_ids[keyword] = len(keywords)
+                    keywords.append(keyword)
+
+        # single words are looked up per token, by text and by lemma; phrases go through a PhraseMatcher
+        term_ids, phrase_patterns, words = {}, {}, []
+        for keyword, keyword_id in keyword_ids.items():
+            if ' ' in keyword:
+                phrase_patterns[keyword] = known_phrases.get(keyword) or token_pattern(nlp.make_doc(keyword))
+            else:
+                term_ids[keyword] = keyword_id
+                words.append(keyword)
+        lemmas = {word: known_lemmas[word] for word in words if word in known_lemmas}
+        if 'lemmatizer' in nlp.pipe_names:
+            unknown = [word for word in words if word not in lemmas]
+            for word, doc in zip(unknown, nlp.pipe(unknown)):
+                lemmas[word] = doc[0].lemma_.lower()
+        for word in words:
+            if word in lemmas:
+                term_ids.setdefault(lemmas[word], keyword_ids[word])
+
+        matrix = np.zeros((len(positions_keywords), len(keywords)), dtype=np.float32)
+        for position_id, position_keywords in enumerate(positions_keywords.values()):
+            for keyword in position_keywords:
+                matrix[position_id, keyword_ids[keyword]] = 1.0
+        # rarer keywords say more about a position; normalise so every position tops out at 1.0
+        matrix /= np.maximum(matrix.sum(axis=0), 1.0)
+        matrix = matrix / np.maximum(matrix.sum(axis=1, keepdims=True), 1e-9)
+        return {'positions_keywords': positions_keywords, 'keywords': keywords, 'term_ids': term_ids,
+                'lemmas': lemmas, 'phrase_patterns': phrase_patterns, 'matrix': matrix}
+
+    def state(self):
+        return {'positions_keywords': self.positions_keywords, 'keywords': self.keywords,
+                'term_ids': self.term_ids, 'lemmas': self.lemmas, 'phrase_patterns': self.phrase_patterns,
+                'matrix': self.matrix}
+
+    @classmethod
+    def from_state(cls, nlp, state):
+        return cls(nlp, state=state)
+
+    def match(self, doc):
+        """Ids of the keywords a parsed document mentions, in one pass over its tokens."""
+        found = set()
+        term_ids = self.term_ids
+        for token in doc:
+            keyword_id = term_ids.get(token.lower_)
+            if keyword_id is None and token.lemma_:
+                keyword_id = term_ids.get(token.lemma_.lower())
+            if keyword_id is not None:
+                found.add(keyword_id)
+        for match_id, start, end in self.phrase_matcher(doc):
+            found.add(self.phrase_ids[match_id])
+        return found
+
+    def match_terms(self, terms):
+        # plain strings (e.g. the verbs experience_verbs collects); phrases are matched as whole strings
+        return {self.keyword_ids[term.lower()] for term in terms if term.lower() in self.keyword_ids}
+
+    def scores(self, matched_sets):
+        # resumes x positions
+        have = np.zeros((len(matched_sets), len(self.keywords)), dtype=np.float32)
+        rows, cols = [], []
+        for row, matched in enumerate(matched_sets):
+            rows.extend([row] * len(matched))
+            cols.extend(matched)
+        have[rows, cols] = 1.0
+        return have @ self.matrix.T
+
+    def rank_many(self, matched_sets, k=5, batch_size=1024):
+        """Top-k positions per resume with their scores; ties keep the CSV order."""
+        matched_sets = list(matched_sets)
+        results = []
+        for start in range(0, len(matched_sets), batch_size):
+            scores = self.scores(matched_sets[start:start + batch_size])
+            order = np.argsort(-scores, axis=1, kind='stable')[:, :k]
+            for row in range(scores.shape[0]):
+                results.append([{'position': self.positions[position_id],
+                                 'score': round(float(scores[row, position_id]), 4)}
+                                for position_id in order[row] if scores[row, position_id] > 0])
+        return results
+
+    def rank(self, matched, k=5):
+        return self.rank_many([matched], k=k)[0]
+
+    def rank_docs(self, docs, k=5, batch_size=1024):
+        return self.rank_many((self.match(doc) for doc in docs), k=k, batch_size=batch_size)
+
+    def best(self, matched):
+        ranked = self.rank(matched, k=1)
+        return ranked[0]['position'] if ranked else NO_POSITION
+# --------------------------------------------------------------------------------
@@ -0,0 +1,127 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+# ----------------------------------Fingerprints----------------------------------
+def pdf_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+def model_fingerprint(nlp, files, extra=()):
+    # any change to the base model version, one of the given files or an extra setting gives a new fingerprint
+    digest = hashlib.sha256()
+    digest.update(f"{nlp.meta.get('name')}-{nlp.meta.get('version')}".encode('utf-8'))
+    for value in extra:
+        digest.update(str(value).encode('utf-8'))
+    for file_path in files:
+        digest.update(os.path.basename(file_path).encode('utf-8'))
+        with open(file_path, 'rb') as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+# --------------------------------------------------------------------------------
+
+# ----------------------------------Result Cache----------------------------------
+class ResultCache:
+    """Parse results stored in SQLite, keyed by PDF hash and model fingerprint.
+
+    Entries written under another fingerprint are never returned and age out
+    through the LRU eviction like any other unused row.
+    """
+
+    def __init__(self, db_path, fingerprint, max_entries=100000, evict_every=100):
+        self.db_path = db_path
+        self.fingerprint = fingerprint
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+    def _connection(self):
+        # connections must not cross a fork, so worker processes open their own
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS parse_results (
+                    pdf_hash TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (pdf_hash, fingerprint)
+                )""")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS parse_results_last_used ON parse_results (last_used)")
+            self._conn.commit()
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, pdf_hash, fingerprint=None):
+        # fingerprint overrides self.fingerprint, for a parser whose fingerprint moves with its taxonomy
+        fingerprint = fingerprint or self.fingerprint
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT result FROM parse_results WHERE pdf_hash = ? AND fingerprint = ?",
+                (pdf_hash, fingerprint)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute(
+                "UPDATE parse_results SET last_used = ? WHERE pdf_hash = ? AND fingerprint = ?",
+                (time.time(), pdf_hash, fingerprint))
+            conn.commit()
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, pdf_hash, result, fingerprint=None):
+        fingerprint = fingerprint or self.fingerprint
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO parse_results (pdf_hash, fingerprint, result, created, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (pdf_hash, fingerprint, json.dumps(result, ensure_ascii=False), now, now))
+            self._puts += 1
+            if self._puts % self.evict_every == 0:
+                self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn):
+        count = conn.execute("SELECT COUNT(*) FROM parse_results").fetchone()[0]
+        if count > self.max_entries:
+            conn.execute(
+                "DELETE FROM parse_results WHERE rowid IN "
+                "(SELECT rowid FROM parse_results ORDER BY last_used LIMIT ?)",
+                (count - self.max_entries,))
+
+    def clear(self):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM parse_results")
+            conn.commit()
+
+    def stats(self):
+        with self._lock:
+            entries = self._connection().execute("SELECT COUNT(*) FROM parse_results").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries,
+            'fingerprint': self.fingerprint,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+# --------------------------------------------------------------------------------
@@ -0,0 +1,344 @@
+import os
+import json
+import numpy as np
+
+FORMAT_VERSION = 1
+
+# the categorical fields of a result; every value is interned to an id in its own vocabulary
+KINDS = ('skill', 'major', 'level', 'position', 'language', 'proficiency')
+
+# one fixed-size row per document; the *_end columns are offsets into the ragged column files, so the
+# entries of document i run from row i - 1's end to row i's end. -1 means the field was empty
+DOC_DTYPE = np.dtype([
+    ('major', '<i4'),
+    ('level', '<i4'),
+    ('position', '<i4'),
+    ('skills_end', '<i8'),
+    ('languages_end', '<i8'),
+    ('source_end', '<i8'),
+])
+LANGUAGE_DTYPE = np.dtype([('language', '<u4'), ('proficiency', '<u4')])
+
+DOCS_FILE = 'docs.bin'
+SKILLS_FILE = 'skills.bin'
+LANGUAGES_FILE = 'languages.bin'
+SOURCES_FILE = 'sources.bin'
+VOCAB_FILE = 'vocab.jsonl'
+META_FILE = 'meta.json'
+
+# ----------------------------------Records---------------------------------------
+class ResumeRecord:
+    """The analytic fields of one parse result, with tuples instead of lists and dicts."""
+
+    __slots__ = ('source', 'major', 'experience_level', 'suggested_position', 'skills', 'languages')
+
+    def __init__(self, source, major=None, experience_level=None, suggested_position=None,
+                 skills=(), languages=()):
+        self.source = source
+        self.major = major
+        self.experience_level = experience_level
+        self.suggested_position = suggested_position
+        self.skills = tuple(skills)
+        # (language, level) pairs
+        self.languages = tuple(languages)
+
+    @classmethod
+    def from_result(cls, source, result):
+        return cls(source,
+                   major=(result.get('major') or '').strip() or None,
+                   experience_level=result.get('experience_level') or None,
+                   suggested_position=result.get('suggested_position') or None,
+                   skills=dict.fromkeys(result.get('skills') or []),
+                   languages=((item['language'], item.get('level') or "Unknown")
+                              for item in result.get('languages') or []))
+
+    def as_dict(self):
+        return {
+            'source': self.source,
+            'major': self.major or "",
+            'experience_level': self.experience_level,
+            'suggested_position': self.suggested_position,
+            'skills': list(self.skills),
+            'languages': [{'language': language, 'level': level} for language, level in self.languages],
+        }
+
+    def __eq__(self, other):
+        return isinstance(other, ResumeRecord) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"ResumeRecord({self.source!r}, major={self.major!r}, skills={len(self.skills)})"
+# --------------------------------------------------------------------------------
+
+# ----------------------------------Vocabulary------------------------------------
+class Vocabulary:
+    """Value <-> id per kind. Ids are dense and never change once handed out."""
+
+    def __init__(self):
+        self.values = {kind: [] for kind in KINDS}
+        self.ids = {kind: {} for kind in KINDS}
+
+    @classmethod
+    def load(cls, file_path):
+        vocab = cls()
+        if os.path.exists(file_path):
+            with open(file_path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    if line.strip():
+                        vocab.intern(*json.loads(line))
+        return vocab
+
+    def intern(self, kind, value):
+        # (id, is_new)
+        ids = self.ids[kind]
+        if value in ids:
+            return ids[value], False
+        ids[value] = len(self.values[kind])
+        self.values[kind].append(value)
+        return ids[value], True
+
+    def get(self, kind, value):
+        return self.ids[kind].get(value)
+
+    def value(self, kind, value_id):
+        return self.values[kind][value_id] if value_id >= 0 else None
+
+    def size(self, kind):
+        return len(self.values[kind])
+# --------------------------------------------------------------------------------
+
+# ----------------------------------Writer----------------------------------------
+class ResultStoreWriter:
+    """Appends results to a columnar store directory in batches.
+
+    Every column is a flat little-endian file, so appending is a write at the
+    end of each file and the reader can memory-map them as they are. The row
+    in docs.bin is written last; a batch cut short by a crash leaves bytes
+    past the last complete row, which the next writer trims away.
+    """
+
+    def __init__(self, path, batch_size=1024):
+        self.path = path
+        self.batch_size = batch_size
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as file:
+                version = json.load(file).get('format_version')
+            if version != FORMAT_VERSION:
+                raise ValueError(f"{path} has store format {version}, expected {FORMAT_VERSION}")
+        else:
+            with open(meta_path, 'w', encoding='utf-8') as file:
+                json.dump({'format_version': FORMAT_VERSION}, file)
+
+        self.vocab = Vocabulary.load(os.path.join(path, VOCAB_FILE))
+        self.ends = self._recover()
+        self._pending = []
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _recover(self):
+        # the offsets the next document starts from, after dropping anything past the last complete row
+        docs_path = self._file(DOCS_FILE)
+        size = os.path.getsize(docs_path) if os.path.exists(docs_path) else 0
+        count = size // DOC_DTYPE.itemsize
+        ends = {'skills': 0, 'languages': 0, 'source': 0, 'count': count}
+        if count:
+            with open(docs_path, 'rb') as file:
+                file.seek((count - 1) * DOC_DTYPE.itemsize)
+                last = np.frombuffer(file.read(DOC_DTYPE.itemsize), dtype=DOC_DTYPE)[0]
+            ends.update(skills=int(last['skills_end']), languages=int(last['languages_end']),
+                        source=int(last['source_end']))
+        for name, end in ((DOCS_FILE, count * DOC_DTYPE.itemsize),
+                          (SKILLS_FILE, ends['skills'] * 4),
+                          (LANGUAGES_FILE, ends['languages'] * LANGUAGE_DTYPE.itemsize),
+                          (SOURCES_FILE, ends['source'])):
+            with open(self._file(name), 'ab') as file:
+                file.truncate(end)
+        return ends
+
+    def __len__(self):
+        return self.ends['count'] + len(self._pending)
+
+    def add(self, source, result):
+        record = result if isinstance(result, ResumeRecord) else ResumeRecord.from_result(source, result)
+        self._pending.append(record)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def add_many(self, items):
+        for source, result in items:
+            self.add(source, result)
+        self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        new_terms = []
+
+        def intern(kind, value):
+            if value is None:
+                return -1
+            value_id, is_new = self.vocab.intern(kind, value)
+            if is_new:
+                new_terms.append((kind, value))
+            return value_id
+
+        docs = np.zeros(len(self._pending), dtype=DOC_DTYPE)
+        skills, languages, sources = [], [], []
+        ends = dict(self.ends)
+        for row, record in enumerate(self._pending):
+            skills.extend(intern('skill', skill) for skill in record.skills)
+            languages.extend((intern('language', language), intern('proficiency', level))
+                             for language, level in record.languages)
+            source = (record.source or '').encode('utf-8')
+            sources.append(source)
+            ends['skills'] += len(record.skills)
+            ends['languages'] += len(record.languages)
+            ends['source'] += len(source)
+            docs[row] = (intern('major', record.major), intern('level', record.experience_level),
+                         intern('position', record.suggested_position),
+                         ends['skills'], ends['languages'], ends['source'])
+        ends['count'] += len(docs)
+
+        # vocabulary first and document rows last, so a row is only ever visible with everything it points to
+        with open(self._file(VOCAB_FILE), 'a', encoding='utf-8') as file:
+            file.writelines(json.dumps([kind, value], ensure_ascii=False) + '\n' for kind, value in new_terms)
+        with open(self._file(SKILLS_FILE), 'ab') as file:
+            file.write(np.asarray(skills, dtype='<u4').tobytes())
+        with open(self._file(LANGUAGES_FILE), 'ab') as file:
+            file.write(np.array(languages, dtype=LANGUAGE_DTYPE).tobytes())
+        with open(self._file(SOURCES_FILE), 'ab') as file:
+            file.write(b''.join(sources))
+        with open(self._file(DOCS_FILE), 'ab') as file:
+            file.write(docs.tobytes())
+        self.ends = ends
+        self._pending = []
+
+    def close(self):
+        self.flush()
+# --------------------------------------------------------------------------------
+
+# ----------------------------------Reader----------------------------------------
+def _map(file_path, dtype):
+    # np.memmap refuses empty files
+    if not os.path.exists(file_path) or os.path.getsize(file_path) < dtype.itemsize:
+        return np.zeros(0, dtype=dtype)
+    count = os.path.getsize(file_path) // dtype.itemsize
+    return np.memmap(file_path, dtype=dtype, mode='r', shape=(count,))
+
+class ResultStore:
+    """Read-only, memory-mapped view of a store written by ResultStoreWriter.
+
+    Only the vocabularies are loaded; aggregates walk the columns in chunks of
+    `chunk_size` documents, so memory stays flat however large the store is.
+    Documents appended after opening are not seen until the store is reopened.
+    """
+
+    def __init__(self, path, chunk_size=1 << 20):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.vocab = Vocabulary.load(os.path.join(path, VOCAB_FILE))
+        self.docs = _map(os.path.join(path, DOCS_FILE), DOC_DTYPE)
+        self.skills = _map(os.path.join(path, SKILLS_FILE), np.dtype('<u4'))
+        self.languages = _map(os.path.join(path, LANGUAGES_FILE), LANGUAGE_DTYPE)
+        self.sources = _map(os.path.join(path, SOURCES_FILE), np.dtype('u1'))
+
+    def __len__(self):
+        return len(self.docs)
+
+    def _span(self, column, start, stop):
+        # [begin, end) of documents start..stop-1 in a ragged column
+        begin = int(self.docs[column][start - 1]) if start else 0
+        return begin, int(self.docs[column][stop - 1]) if stop > start else begin
+
+    def record(self, index):
+        value = self.vocab.value
+        doc = self.docs[index]
+        skills = self.skills[slice(*self._span('skills_end', index, index + 1))]
+        languages = self.languages[slice(*self._span('languages_end', index, index + 1))]
+        source = self.sources[slice(*self._span('source_end', index, index + 1))]
+        return ResumeRecord(bytes(source).decode('utf-8'),
+                            major=value('major', int(doc['major'])),
+                            experience_level=value('level', int(doc['level'])),
+                            suggested_position=value('position', int(doc['position'])),
+                            skills=(value('skill', int(skill)) for skill in skills),
+                            languages=((value('language', int(language)), value('proficiency', int(level)))
+                                       for language, level in languages))
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.record(index)
+
+    def _chunks(self):
+        for start in range(0, len(self.docs), self.chunk_size):
+            yield start, min(start + self.chunk_size, len(self.docs))
+
+    def _counts(self, groups, values, width, into):
+        # add the number of times every (group, value) pair occurs to into[group][value]
+        keys = (groups.astype(np.int64) + 1) * width + values.astype(np.int64)
+        keys, counts = np.unique(keys, return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            group, value_id = divmod(key, width)
+            into.setdefault(group - 1, {})
+            into[group - 1][value_id] = into[group - 1].get(value_id, 0) + count
+
+    def _named(self, by, value_kind, counted, top):
+        # ids back to names, most frequent first
+        return {(self.vocab.value(by, group) if by else None):
+                sorted(((self.vocab.value(value_kind, value_id), count) for value_id, count in values.items()),
+                       key=lambda item: (-item[1], str(item[0])))[:top]
+                for group, values in counted.items()}
+
+    def _check_by(self, by, what='group by'):
+        if by is not None and by not in ('major', 'level', 'position'):
+            raise ValueError(f"cannot {what} {by!r}; use major, level or position")
+
+    def skill_frequencies(self, by=None, top=None):
+        """{group: [(skill, resumes)]}, most frequent first; the single group is None without `by`."""
+        self._check_by(by)
+        counted = {}
+        width = self.vocab.size('skill') + 1
+        for start, stop in self._chunks():
+            begin, end = self._span('skills_end', start, stop)
+            docs = self.docs[start:stop]
+            lengths = np.diff(docs['skills_end'], prepend=begin)
+            groups = np.repeat(docs[by] if by else np.full(len(docs), -1, dtype=np.int32), lengths)
+            self._counts(groups, self.skills[begin:end], width, counted)
+        return self._named(by, 'skill', counted, top)
+
+    def language_frequencies(self, by=None, top=None):
+        self._check_by(by)
+        counted = {}
+        width = self.vocab.size('language') + 1
+        for start, stop in self._chunks():
+            begin, end = self._span('languages_end', start, stop)
+            docs = self.docs[start:stop]
+            lengths = np.diff(docs['languages_end'], prepend=begin)
+            groups = np.repeat(docs[by] if by else np.full(len(docs), -1, dtype=np.int32), lengths)
+            self._counts(groups, self.languages['language'][begin:end], width, counted)
+        return self._named(by, 'language', counted, top)
+
+    def value_counts(self, field, by=None, top=None):
+        """{group: [(value, resumes)]} for major, level or position; None counts the resumes without one."""
+        self._check_by(field, 'count')
+        self._check_by(by)
+        counted = {}
+        # empty values (-1) are shifted to id 0 while counting
+        width = self.vocab.size(field) + 2
+        for start, stop in self._chunks():
+            docs = self.docs[start:stop]
+            groups = docs[by] if by else np.full(len(docs), -1, dtype=np.int32)
+            self._counts(groups, docs[field].astype(np.int64) + 1, width, counted)
+        counted = {group: {value_id - 1: count for value_id, count in values.items()}
+                   for group, values in counted.items()}
+        return self._named(by, field, counted, top)
+
+    def level_distribution(self, by=None):
+        return self.value_counts('level', by=by)
+
+    def close(self):
+        # dropping the references unmaps the files
+        self.docs = self.skills = self.languages = self.sources = None
+# --------------------------------------------------------------------------------
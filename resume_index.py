@@ -0,0 +1,398 @@
+import os
+import re
+import csv
+import zlib
+import sqlite3
+from collections import OrderedDict
+
+MAJORS_CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'majors.csv')
+
+# experience levels in increasing order, as produced by ResumeParser.extract_experience
+LEVELS = ['Entry Level', 'Mid-Junior', 'Mid-Senior', 'Senior']
+FIELDS = ('skill', 'major', 'category', 'position', 'level', 'language')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS terms (
+    term_id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL,
+    UNIQUE (kind, value)
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term_id INTEGER PRIMARY KEY REFERENCES terms (term_id),
+    bitmap BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id INTEGER PRIMARY KEY,
+    external_id TEXT NOT NULL,
+    deleted INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS documents_external_id ON documents (external_id);
+"""
+
+def load_major_categories(file_path):
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return {row['Major'].lower(): row['Major_Category'] for row in csv.DictReader(file)}
+
+# ----------------------------------Bitmaps---------------------------------------
+# posting lists are Python ints used as bitsets (bit n = doc_id n), zlib-compressed on disk
+def encode_bitmap(bitmap):
+    return zlib.compress(bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little'))
+
+def decode_bitmap(blob):
+    return int.from_bytes(zlib.decompress(blob), 'little')
+
+def bitmap_from_ids(doc_ids):
+    # built in a byte buffer: OR-ing one bit at a time into an int copies the whole int for every id
+    data = bytearray(max(doc_ids) // 8 + 1)
+    for doc_id in doc_ids:
+        data[doc_id >> 3] |= 1 << (doc_id & 7)
+    return int.from_bytes(data, 'little')
+
+def lowest_bits(bitmap, count):
+    # the `count` smallest doc ids in bitmap, without walking the rest
+    while bitmap and count:
+        low = bitmap & -bitmap
+        yield low.bit_length() - 1
+        bitmap ^= low
+        count -= 1
+
+# a bit-sliced counter holds one non-negative integer per doc: slices[j] is the bitmap of docs whose value has bit j set
+def sliced_add(slices, bitmap, value):
+    # adds value to every doc in bitmap with a ripple-carry adder over whole bitmaps
+    carry = 0
+    position = 0
+    while value >> position or carry:
+        addend = bitmap if value >> position & 1 else 0
+        if position == len(slices):
+            slices.append(0)
+        current = slices[position]
+        slices[position] = current ^ addend ^ carry
+        carry = (current & addend) | (carry & (current ^ addend))
+        position += 1
+
+def sliced_top(slices, candidates, k):
+    """(above, tied): the docs of candidates with a value above the k-th largest (fewer than k) and those equal to it."""
+    above, tied = 0, candidates
+    for bits in reversed(slices):
+        higher = tied & bits
+        if above.bit_count() + higher.bit_count() >= k:
+            tied = higher
+        else:
+            above |= higher
+            tied &= ~bits
+    return above, tied
+
+def integer_weights(weights):
+    # the weights times the smallest power of ten (10**6 at most) that makes every one a whole number
+    for digits in range(7):
+        scale = 10 ** digits
+        if all(float(weight * scale).is_integer() for weight in weights):
+            break
+    return [round(weight * scale) for weight in weights]
+
+def iter_bits(bitmap):
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')
+    for byte_index, byte in enumerate(data):
+        if byte:
+            base = byte_index * 8
+            for bit in range(8):
+                if byte >> bit & 1:
+                    yield base + bit
+# --------------------------------------------------------------------------------
+
+# ----------------------------------Query Parser----------------------------------
+TOKEN_RE = re.compile(r'''\s*(?:
+    (?P<paren>[()])
+  | (?P<field>\w+)\s*(?P<op>>=|<=|=|>|<|:)\s*(?P<fvalue>"[^"]*"|[^\s()]+)
+  | (?P<quoted>"[^"]*")
+  | (?P<word>[^\s()]+)
+)''', re.VERBOSE)
+
+def tokenize(query):
+    tokens = []
+    position = 0
+    query = query.strip()
+    while position < len(query):
+        match = TOKEN_RE.match(query, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"cannot parse query at: {query[position:]!r}")
+        position = match.end()
+        if match.group('paren'):
+            tokens.append((match.group('paren'), None, None))
+        elif match.group('field') and match.group('field').lower() in FIELDS:
+            tokens.append(('term', (match.group('field').lower(), match.group('op')),
+                           match.group('fvalue').strip('"')))
+        elif match.group('field'):
+            raise ValueError(f"unknown field {match.group('field')!r}; use one of {', '.join(FIELDS)}")
+        elif match.group('quoted'):
+            tokens.append(('term', ('skill', ':'), match.group('quoted').strip('"')))
+        elif match.group('word').upper() in ('AND', 'OR', 'NOT'):
+            tokens.append((match.group('word').upper(), None, None))
+        else:
+            tokens.append(('term', ('skill', ':'), match.group('word')))
+    return tokens
+
+class _QueryParser:
+    # expr := and (OR and)* ; and := not (AND? not)* ; not := NOT not | '(' expr ')' | term
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position][0] if self.position < len(self.tokens) else None
+
+    def take(self):
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def parse(self):
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise ValueError(f"unexpected {self.peek()!r} in query")
+        return node
+
+    def parse_or(self):
+        node = self.parse_and()
+        while self.peek() == 'OR':
+            self.take()
+            node = ('OR', node, self.parse_and())
+        return node
+
+    def parse_and(self):
+        node = self.parse_not()
+        while self.peek() in ('AND', 'NOT', 'term', '('):
+            if self.peek() == 'AND':
+                self.take()
+            node = ('AND', node, self.parse_not())
+        return node
+
+    def parse_not(self):
+        kind = self.peek()
+        if kind == 'NOT':
+            self.take()
+            return ('NOT', self.parse_not())
+        if kind == '(':
+            self.take()
+            node = self.parse_or()
+            if self.peek() != ')':
+                raise ValueError("missing ')' in query")
+            self.take()
+            return node
+        if kind == 'term':
+            _, (field, op), value = self.take()
+            return ('TERM', field, op, value)
+        raise ValueError(f"unexpected {kind!r} in query")
+
+def parse_query(query):
+    return _QueryParser(tokenize(query)).parse()
+# --------------------------------------------------------------------------------
+
+# ----------------------------------Resume Index----------------------------------
+class ResumeIndex:
+    """Persistent inverted index over parse results, kept in one local SQLite file.
+
+    Skills, majors, major categories, positions, levels and languages are
+    interned to integer term ids, and every term has a compressed bitmap of
+    the documents carrying it. Boolean queries are bitwise operations on
+    those bitmaps; only ranking walks individual document ids.
+    """
+
+    def __init__(self, path, majors_csv=MAJORS_CSV_PATH, bitmap_cache_size=4096):
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+        self.categories = load_major_categories(majors_csv)
+        self.term_ids = {(kind, value): term_id
+                         for term_id, kind, value in self.conn.execute("SELECT term_id, kind, value FROM terms")}
+        self.doc_count = self.conn.execute("SELECT COALESCE(MAX(doc_id) + 1, 0) FROM documents").fetchone()[0]
+        self.deleted = 0
+        for (doc_id,) in self.conn.execute("SELECT doc_id FROM documents WHERE deleted = 1"):
+            self.deleted |= 1 << doc_id
+        self.bitmap_cache_size = bitmap_cache_size
+        self._bitmaps = OrderedDict()
+        self._dirty = set()
+        # doc ids added since the last flush, per term; merged into the bitmap once, when it is flushed or read
+        self._pending_ids = {}
+        self._pending_docs = []
+        # external_id -> doc_id of the documents in _pending_docs, so a re-add finds the one it replaces at once
+        self._pending_external = {}
+        self._pending_deletes = []
+
+    # ----------------------------------Writing-----------------------------------
+    def document_terms(self, result):
+        terms = {('skill', skill.lower()) for skill in result.get('skills') or []}
+        major = (result.get('major') or '').strip()
+        if major:
+            terms.add(('major', major.lower()))
+            category = self.categories.get(major.lower())
+            if category:
+                terms.add(('category', category.lower()))
+        for field, key in (('position', 'suggested_position'), ('level', 'experience_level')):
+            if result.get(key):
+                terms.add((field, result[key].lower()))
+        for language in result.get('languages') or []:
+            terms.add(('language', language['language'].lower()))
+        return terms
+
+    def _term_id(self, term):
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            term_id = self.conn.execute("INSERT INTO terms (kind, value) VALUES (?, ?)", term).lastrowid
+            self.term_ids[term] = term_id
+        return term_id
+
+    def add(self, external_id, result):
+        # re-adding an id replaces the earlier document
+        replaced = [self._pending_external[external_id]] if external_id in self._pending_external else []
+        replaced += [doc_id for (doc_id,) in self.conn.execute(
+            "SELECT doc_id FROM documents WHERE external_id = ? AND deleted = 0", (external_id,))]
+        for doc_id in replaced:
+            self.deleted |= 1 << doc_id
+            self._pending_deletes.append(doc_id)
+        doc_id = self.doc_count
+        self.doc_count += 1
+        self._pending_docs.append((doc_id, external_id))
+        self._pending_external[external_id] = doc_id
+        for term in self.document_terms(result):
+            self._pending_ids.setdefault(self._term_id(term), []).append(doc_id)
+        return doc_id
+
+    def add_many(self, items):
+        for external_id, result in items:
+            self.add(external_id, result)
+        self.flush()
+
+    def flush(self):
+        for term_id in list(self._pending_ids):
+            self._bitmap(term_id)
+        with self.conn:
+            self.conn.executemany("INSERT INTO documents (doc_id, external_id) VALUES (?, ?)", self._pending_docs)
+            self.conn.executemany("UPDATE documents SET deleted = 1 WHERE doc_id = ?",
+                                  [(doc_id,) for doc_id in self._pending_deletes])
+            self.conn.executemany("INSERT OR REPLACE INTO postings (term_id, bitmap) VALUES (?, ?)",
+                                  [(term_id, encode_bitmap(self._bitmaps[term_id])) for term_id in self._dirty])
+        self._pending_docs = []
+        self._pending_external = {}
+        self._pending_deletes = []
+        self._dirty = set()
+        self._trim_cache()
+
+    # ----------------------------------Reading-----------------------------------
+    def _bitmap(self, term_id):
+        bitmap = self._bitmaps.get(term_id)
+        if bitmap is not None:
+            self._bitmaps.move_to_end(term_id)
+        else:
+            row = self.conn.execute("SELECT bitmap FROM postings WHERE term_id = ?", (term_id,)).fetchone()
+            bitmap = decode_bitmap(row[0]) if row else 0
+        pending = self._pending_ids.pop(term_id, None)
+        if pending:
+            bitmap |= bitmap_from_ids(pending)
+            self._dirty.add(term_id)
+        self._bitmaps[term_id] = bitmap
+        self._trim_cache()
+        return bitmap
+
+    def _trim_cache(self):
+        # dirty bitmaps are not yet on disk and must stay in memory until flush()
+        while len(self._bitmaps) > self.bitmap_cache_size:
+            for term_id in self._bitmaps:
+                if term_id not in self._dirty:
+                    del self._bitmaps[term_id]
+                    break
+            else:
+                return
+
+    def term_bitmap(self, field, value):
+        term_id = self.term_ids.get((field, value.lower()))
+        return self._bitmap(term_id) if term_id is not None else 0
+
+    def _live(self):
+        return ((1 << self.doc_count) - 1) & ~self.deleted
+
+    def _term(self, field, op, value):
+        if field == 'level' and op in ('>=', '<=', '>', '<', '='):
+            levels = {level.lower(): rank for rank, level in enumerate(LEVELS)}
+            if value.lower() not in levels:
+                raise ValueError(f"unknown level {value!r}; use one of {', '.join(LEVELS)}")
+            rank = levels[value.lower()]
+            compare = {'>=': rank.__le__, '<=': rank.__ge__, '>': rank.__lt__, '<': rank.__gt__, '=': rank.__eq__}[op]
+            bitmap = 0
+            for level, level_rank in levels.items():
+                if compare(level_rank):
+                    bitmap |= self.term_bitmap('level', level)
+            return bitmap
+        if op not in (':', '='):
+            raise ValueError(f"{op} only applies to level")
+        return self.term_bitmap(field, value)
+
+    def _evaluate(self, node):
+        kind = node[0]
+        if kind == 'TERM':
+            return self._term(*node[1:])
+        if kind == 'AND':
+            return self._evaluate(node[1]) & self._evaluate(node[2])
+        if kind == 'OR':
+            return self._evaluate(node[1]) | self._evaluate(node[2])
+        return self._live() & ~self._evaluate(node[1])
+
+    def _positive_terms(self, node, negated=False):
+        if node[0] == 'TERM':
+            if not negated:
+                yield node[1:]
+        elif node[0] == 'NOT':
+            yield from self._positive_terms(node[1], not negated)
+        else:
+            yield from self._positive_terms(node[1], negated)
+            yield from self._positive_terms(node[2], negated)
+
+    def match(self, query):
+        return self._evaluate(parse_query(query)) & self._live() if query else self._live()
+
+    def count(self, query=None):
+        return self.match(query).bit_count()
+
+    def search(self, query=None, weights=None, k=10):
+        """Top-k (external_id, score) for a boolean query.
+
+        weights maps terms ("python", "skill:aws", "level:senior") to scores; a
+        document scores the sum of the weights it matches. Without weights each
+        positive term of the query counts 1.
+        """
+        if self._pending_docs:
+            self.flush()
+        candidates = self.match(query)
+        if weights is None:
+            terms = list(self._positive_terms(parse_query(query))) if query else []
+            weighted = [(self._term(*term), 1.0) for term in terms]
+        else:
+            weighted = []
+            for term, weight in weights.items():
+                (_, (field, op), value), = tokenize(term)
+                weighted.append((self._term(field, op, value), weight))
+
+        # scores are summed for all candidates at once in a bit-sliced counter; only the top k docs are visited.
+        # a negative weight is added to the docs without the term instead, which shifts every score alike
+        scaled = integer_weights([weight for _, weight in weighted])
+        slices = []
+        for (bitmap, _), value in zip(weighted, scaled):
+            if value < 0:
+                sliced_add(slices, candidates & ~bitmap, -value)
+            else:
+                sliced_add(slices, candidates & bitmap, value)
+        above, tied = sliced_top(slices, candidates, k)
+        doc_ids = list(iter_bits(above)) + list(lowest_bits(tied, k - above.bit_count()))
+        scores = {doc_id: sum((weight for bitmap, weight in weighted if bitmap >> doc_id & 1), 0.0)
+                  for doc_id in doc_ids}
+
+        top = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]
+        external_ids = dict(self.conn.execute(
+            f"SELECT doc_id, external_id FROM documents WHERE doc_id IN ({','.join('?' * len(top))})",
+            [doc_id for doc_id, _ in top])) if top else {}
+        return [(external_ids.get(doc_id), score) for doc_id, score in top]
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+# --------------------------------------------------------------------------------
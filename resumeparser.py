@@ -0,0 +1,360 @@
+import gc
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+# ----------------------------------Worker Process--------------------------------
+_worker_parser = None
+
+def _init_worker(cache_path=None, artifacts_path=None, ready=None):
+    # every worker loads the spaCy models once and reuses them for all of its files
+    global _worker_parser
+    # a worker forked from a parent that built and warmed the parser already (prefork) has nothing to load
+    if _worker_parser is None:
+        from app import ResumeParser
+        _worker_parser = ResumeParser(cache_path=cache_path, artifacts_path=artifacts_path)
+    # ready: a multiprocessing queue that gets the pid of every worker once its models are loaded
+    if ready is not None:
+        ready.put(os.getpid())
+
+def _parse_file(source, fields=None):
+    return _worker_parser.parse(source, fields=fields)
+
+def _prefork_parser(cache_path=None, artifacts_path=None):
+    # build and warm the parser in this process; forked workers then share its pages copy-on-write
+    _init_worker(cache_path, artifacts_path)
+    _worker_parser.warm_up()
+    # objects that exist now are never scanned by the collector again, so it does not dirty the shared pages
+    gc.collect()
+    gc.freeze()
+
+def worker_pool(workers, cache_path=None, artifacts_path=None, prefork=False, ready=None):
+    if prefork:
+        _prefork_parser(cache_path, artifacts_path)
+        return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork'),
+                                   initializer=_init_worker, initargs=(cache_path, artifacts_path, ready))
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               initargs=(cache_path, artifacts_path, ready))
+# --------------------------------------------------------------------------------
+
+def find_pdfs(target):
+    if os.path.isdir(target):
+        paths = glob.glob(os.path.join(target, '**', '*.pdf'), recursive=True)
+    else:
+        paths = glob.glob(target, recursive=True)
+    return sorted(path for path in paths if os.path.isfile(path))
+
+def load_checkpoint(checkpoint_path):
+    if not os.path.exists(checkpoint_path):
+        return set()
+    with open(checkpoint_path, 'r', encoding='utf-8') as file:
+        return set(line.rstrip('\n') for line in file if line.strip())
+
+def ingest(paths, out_path, workers=None, checkpoint_path=None, max_in_flight=None, cache_path=None,
+           artifacts_path=None, prefork=False, max_restarts=3):
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 2
+    checkpoint_path = checkpoint_path or out_path + '.checkpoint'
+
+    done = load_checkpoint(checkpoint_path)
+    remaining = [path for path in paths if path not in done]
+    skipped = len(paths) - len(remaining)
+    pending = iter(remaining)
+
+    parsed = 0
+    errors = []
+    # paths whose worker died under them; they are not the file's failure, so they are retried, never checkpointed
+    lost = []
+    restarts = 0
+    interrupted = None
+    started = time.perf_counter()
+
+    pool = worker_pool(workers, cache_path, artifacts_path, prefork)
+    in_flight = {}
+
+    def submit(path):
+        try:
+            in_flight[pool.submit(_parse_file, path)] = path
+        except BrokenProcessPool:
+            lost.append(path)
+
+    def submit_next():
+        for path in pending:
+            submit(path)
+            return True
+        return False
+
+    try:
+        with open(out_path, 'a', encoding='utf-8') as out, \
+                open(checkpoint_path, 'a', encoding='utf-8') as checkpoint:
+            # keep a bounded number of files queued so memory stays flat on huge directories
+            while len(in_flight) < max_in_flight and submit_next():
+                pass
+
+            while in_flight or lost:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED) if in_flight else ((), ())
+                for future in finished:
+                    path = in_flight.pop(future)
+                    try:
+                        record = {'path': path, 'result': future.result()}
+                        parsed += 1
+                    except BrokenProcessPool:
+                        lost.append(path)
+                        continue
+                    except Exception as exc:
+                        record = {'path': path, 'error': f"{type(exc).__name__}: {exc}"}
+                        errors.append((path, record['error']))
+
+                    out.write(json.dumps(record, ensure_ascii=False) + '\n')
+                    out.flush()
+                    # the checkpoint is only advanced once the result line is on disk
+                    checkpoint.write(path + '\n')
+                    checkpoint.flush()
+
+                    submit_next()
+
+                if lost:
+                    # a dead worker takes the whole pool down: everything still in flight is lost with it
+                    lost.extend(in_flight.values())
+                    in_flight.clear()
+                    pool.shutdown(cancel_futures=True)
+                    if restarts == max_restarts:
+                        interrupted = f"the worker pool broke {restarts + 1} times"
+                        break
+                    restarts += 1
+                    pool = worker_pool(workers, cache_path, artifacts_path, prefork)
+                    retry, lost = lost, []
+                    for path in retry:
+                        submit(path)
+                    while len(in_flight) < max_in_flight and submit_next():
+                        pass
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+    elapsed = time.perf_counter() - started
+    return {
+        'parsed': parsed,
+        'failed': len(errors),
+        'skipped': skipped,
+        'seconds': elapsed,
+        'docs_per_sec': (parsed + len(errors)) / elapsed if elapsed else 0.0,
+        'errors': errors,
+        'restarts': restarts,
+        # set when the run gave up; the files that were in flight and the ones never started are left for the next run
+        'interrupted': interrupted,
+        'unfinished': len(lost) + sum(1 for _ in pending),
+    }
+
+def print_report(report, stream=sys.stderr):
+    print(f"parsed {report['parsed']}, failed {report['failed']}, "
+          f"skipped {report['skipped']} (already in checkpoint)", file=stream)
+    print(f"{report['seconds']:.1f}s, {report['docs_per_sec']:.2f} docs/sec", file=stream)
+    if report['restarts']:
+        print(f"worker pool restarted {report['restarts']} times after a worker died", file=stream)
+    if report['interrupted']:
+        print(f"stopped early: {report['interrupted']}; {report['unfinished']} files left for the next run",
+              file=stream)
+    for path, error in report['errors']:
+        print(f"  {path}: {error}", file=stream)
+
+# ----------------------------------Command Line----------------------------------
+def build_arg_parser():
+    parser = argparse.ArgumentParser(prog='python -m resumeparser')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest_cmd = commands.add_parser('ingest', help='parse every PDF in a directory or glob into a JSONL file')
+    ingest_cmd.add_argument('target', help='directory (searched recursively) or glob pattern')
+    ingest_cmd.add_argument('--out', required=True, help='JSONL output file, appended to')
+    ingest_cmd.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    ingest_cmd.add_argument('--checkpoint', default=None, help='checkpoint file (default: <out>.checkpoint)')
+    ingest_cmd.add_argument('--max-in-flight', type=int, default=None,
+                            help='files queued at once (default: 2 x workers)')
+    ingest_cmd.add_argument('--cache', default=None, help='SQLite result cache shared by the workers')
+    ingest_cmd.add_argument('--artifacts', default=None, help='precompiled keyword tables (see the bundle command)')
+    ingest_cmd.add_argument('--prefork', action='store_true',
+                            help='load the models once and fork the workers from it (shared copy-on-write)')
+
+    worker_cmd = commands.add_parser('worker', help='parse new rows of user_uploaded_pdfs into pdf_parse_results')
+    worker_cmd.add_argument('--db', default=None, help='uploads database (default: data/user_pdfs.db)')
+    worker_cmd.add_argument('--batch-size', type=int, default=16, help='rows claimed per transaction')
+    worker_cmd.add_argument('--once', action='store_true', help='exit when no unparsed rows are left')
+    worker_cmd.add_argument('--cache', default=None, help='SQLite result cache')
+    worker_cmd.add_argument('--artifacts', default=None, help='precompiled keyword tables (see the bundle command)')
+
+    serve_cmd = commands.add_parser('serve', help='run the local HTTP parsing service')
+    serve_cmd.add_argument('--host', default='127.0.0.1')
+    serve_cmd.add_argument('--port', type=int, default=8000)
+    serve_cmd.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    serve_cmd.add_argument('--max-pending', type=int, default=None,
+                           help='parses queued or running before uploads get 429 (default: 4 x workers)')
+    serve_cmd.add_argument('--cache', default=None, help='SQLite result cache')
+    serve_cmd.add_argument('--artifacts', default=None, help='precompiled keyword tables (see the bundle command)')
+    serve_cmd.add_argument('--prefork', action='store_true',
+                           help='load the models once and fork the workers from it (shared copy-on-write)')
+
+    index_cmd = commands.add_parser('index', help='add ingest JSONL results to a search index')
+    index_cmd.add_argument('results', help='JSONL written by ingest')
+    index_cmd.add_argument('--index', required=True, help='index file')
+
+    search_cmd = commands.add_parser('search', help='query a search index')
+    search_cmd.add_argument('query', help='e.g. \'Python AND (AWS OR Azure) AND level>=Mid-Senior\'')
+    search_cmd.add_argument('--index', required=True, help='index file')
+    search_cmd.add_argument('-k', type=int, default=10, help='number of results')
+
+    store_cmd = commands.add_parser('store', help='append ingest JSONL results to a columnar result store')
+    store_cmd.add_argument('results', help='JSONL written by ingest')
+    store_cmd.add_argument('--store', required=True, help='store directory, appended to')
+    store_cmd.add_argument('--batch-size', type=int, default=1024, help='results written per batch')
+
+    stats_cmd = commands.add_parser('stats', help='aggregate a columnar result store')
+    stats_cmd.add_argument('what', choices=('skills', 'languages', 'major', 'level', 'position'))
+    stats_cmd.add_argument('--store', required=True, help='store directory')
+    stats_cmd.add_argument('--by', choices=('major', 'level', 'position'), default=None, help='group by this field')
+    stats_cmd.add_argument('--top', type=int, default=10, help='values per group')
+
+    gaps_cmd = commands.add_parser('gaps', help='rank roles and missing skills for every resume in ingest JSONL')
+    gaps_cmd.add_argument('results', help='JSONL written by ingest')
+    gaps_cmd.add_argument('--out', required=True, help='JSONL output file')
+    gaps_cmd.add_argument('-k', type=int, default=5, help='roles per resume')
+
+    bench_cmd = commands.add_parser('bench', help='time every extraction stage on a synthetic corpus')
+    bench_cmd.add_argument('--docs', type=int, default=50, help='number of synthetic resumes')
+    bench_cmd.add_argument('--seed', type=int, default=0, help='corpus seed')
+    bench_cmd.add_argument('--corpus-dir', default=None, help='where the corpus is written (default: data/bench)')
+    bench_cmd.add_argument('--baseline', default=None, help='fail if a stage p95 regresses past this report')
+    bench_cmd.add_argument('--tolerance', type=float, default=0.25, help='allowed p95 growth over the baseline')
+    bench_cmd.add_argument('--save-baseline', default=None, help='write this run as a baseline report')
+    bench_cmd.add_argument('--cold-start', action='store_true',
+                           help='time worker start-up to the first parse and report per-worker memory instead')
+    bench_cmd.add_argument('--workers', type=int, default=4, help='worker processes for --cold-start')
+    bench_cmd.add_argument('--prefork', action='store_true', help='fork the --cold-start workers from a warm parent')
+    bench_cmd.add_argument('--artifacts', default=None, help='precompiled keyword tables for the workers')
+
+    bundle_cmd = commands.add_parser('bundle', help='precompile the keyword tables into one artifact file')
+    bundle_cmd.add_argument('--out', default=None, help='artifact file (default: data/artifacts.bin)')
+    bundle_cmd.add_argument('--model', default='en_core_web_sm', help='spaCy pipeline the tables are built for')
+
+    train_cmd = commands.add_parser('train', help='compile the skills training data and retrain the SKILL recognizer')
+    train_cmd.add_argument('--output', default=None, help='model directory (default: TrainedModel/skills)')
+    train_cmd.add_argument('--corpus-dir', default=None, help='where the DocBin corpus is written '
+                                                              '(default: data/skills_corpus)')
+    train_cmd.add_argument('--dev-fraction', type=float, default=0.2, help='share of examples held out for dev')
+    train_cmd.add_argument('--epochs', type=int, default=30, help='maximum number of epochs')
+    train_cmd.add_argument('--patience', type=int, default=4, help='epochs without a better dev score before stopping')
+    train_cmd.add_argument('--seed', type=int, default=0, help='seed for the split, the shuffles and the weights')
+    train_cmd.add_argument('--strict', action='store_true', help='fail instead of dropping misaligned entities')
+    return parser
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+
+    if args.command == 'ingest':
+        paths = find_pdfs(args.target)
+        if not paths:
+            print(f"no PDFs found for {args.target}", file=sys.stderr)
+            return 1
+        report = ingest(paths, args.out, workers=args.workers,
+                        checkpoint_path=args.checkpoint, max_in_flight=args.max_in_flight,
+                        cache_path=args.cache, artifacts_path=args.artifacts, prefork=args.prefork)
+        print_report(report)
+        return 1 if report['failed'] or report['interrupted'] else 0
+
+    if args.command == 'worker':
+        from app import ResumeParser
+        from db_worker import UploadsWorker, UPLOADS_DB_PATH
+        worker = UploadsWorker(ResumeParser(cache_path=args.cache, artifacts_path=args.artifacts), db_path=args.db or UPLOADS_DB_PATH,
+                               batch_size=args.batch_size)
+        try:
+            processed = worker.run(once=args.once)
+        finally:
+            worker.close()
+        print(f"processed {processed} uploads", file=sys.stderr)
+
+    if args.command == 'index':
+        from resume_index import ResumeIndex
+        index = ResumeIndex(args.index)
+        with open(args.results, 'r', encoding='utf-8') as file:
+            records = (json.loads(line) for line in file if line.strip())
+            index.add_many((record['path'], record['result']) for record in records if 'result' in record)
+        print(f"{index.count()} documents indexed", file=sys.stderr)
+        index.close()
+
+    if args.command == 'search':
+        from resume_index import ResumeIndex
+        index = ResumeIndex(args.index)
+        for external_id, score in index.search(args.query, k=args.k):
+            print(f"{score:6.2f}  {external_id}")
+        index.close()
+
+    if args.command == 'store':
+        from result_store import ResultStoreWriter
+        writer = ResultStoreWriter(args.store, batch_size=args.batch_size)
+        with open(args.results, 'r', encoding='utf-8') as file:
+            records = (json.loads(line) for line in file if line.strip())
+            writer.add_many((record['path'], record['result']) for record in records if 'result' in record)
+        print(f"{len(writer)} resumes in {args.store}", file=sys.stderr)
+
+    if args.command == 'stats':
+        from result_store import ResultStore
+        store = ResultStore(args.store)
+        if args.what == 'skills':
+            groups = store.skill_frequencies(by=args.by, top=args.top)
+        elif args.what == 'languages':
+            groups = store.language_frequencies(by=args.by, top=args.top)
+        else:
+            groups = store.value_counts(args.what, by=args.by, top=args.top)
+        for group, counts in sorted(groups.items(), key=lambda item: str(item[0])):
+            if args.by:
+                print(f"{args.by}: {group if group is not None else '-'}")
+            for value, count in counts:
+                print(f"{count:8d}  {value if value is not None else '-'}")
+
+    if args.command == 'gaps':
+        from skill_gap import SkillGapRecommender
+        recommender = SkillGapRecommender()
+        with open(args.results, 'r', encoding='utf-8') as file:
+            records = [json.loads(line) for line in file if line.strip()]
+        records = [record for record in records if 'result' in record]
+        gaps = recommender.recommend_many([record['result'].get('skills') or [] for record in records], k=args.k)
+        with open(args.out, 'w', encoding='utf-8') as out:
+            for record, record_gaps in zip(records, gaps):
+                out.write(json.dumps({'path': record['path'], 'skill_gaps': record_gaps}, ensure_ascii=False) + '\n')
+        print(f"{len(records)} resumes scored against {len(recommender.roles)} roles", file=sys.stderr)
+
+    if args.command == 'bench':
+        import benchmark
+        return benchmark.main(args)
+
+    if args.command == 'bundle':
+        from app import ResumeParser
+        from artifacts import ARTIFACTS_PATH
+        out_path = args.out or ARTIFACTS_PATH
+        if os.path.exists(out_path):
+            os.remove(out_path)
+        ResumeParser(model=args.model, artifacts_path=out_path)
+        print(f"wrote {out_path} ({os.path.getsize(out_path) / 1024:.0f} KB)", file=sys.stderr)
+
+    if args.command == 'train':
+        import skills_training
+        return skills_training.main(args)
+
+    if args.command == 'serve':
+        import asyncio
+        from parse_server import serve
+        print(f"serving on http://{args.host}:{args.port}", file=sys.stderr)
+        try:
+            asyncio.run(serve(args.host, args.port, workers=args.workers,
+                              max_pending=args.max_pending, cache_path=args.cache,
+                              artifacts_path=args.artifacts, prefork=args.prefork))
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+import re
+from collections import namedtuple
+
+# a section's content runs from the line after its header up to the next header (end_* exclusive)
+Section = namedtuple('Section', ['name', 'header', 'start_line', 'end_line', 'start_char', 'end_char'])
+
+SECTION_HEADINGS = {
+    'volunteering': ['volunteer experience', 'volunteering'],
+    'experience': ['work experience', 'professional experience', 'employment history', 'work history',
+                   'experience', 'employment'],
+    'education': ['academic background', 'education', 'qualifications'],
+    'skills': ['technical skills', 'skills', 'technologies', 'competencies'],
+    'languages': ['languages'],
+    'projects': ['projects'],
+    'certifications': ['certifications', 'certificates', 'courses'],
+    'summary': ['summary', 'profile', 'objective', 'about me'],
+    'references': ['references'],
+    'interests': ['interests', 'hobbies'],
+    'awards': ['awards', 'honors', 'achievements'],
+    'publications': ['publications'],
+}
+
+# headings are short lines; anything longer is content that happens to mention a heading word
+MAX_HEADER_WORDS = 4
+
+HEADER_RE = re.compile(
+    r'\b(?:' + '|'.join(
+        f"(?P<{name}>{'|'.join(re.escape(heading) for heading in headings)})"
+        for name, headings in SECTION_HEADINGS.items()) + r')\b',
+    re.IGNORECASE)
+
+# ----------------------------------Section Index---------------------------------
+class SectionIndex:
+    """Section name -> line and character spans of one text, built in a single walk over its lines."""
+
+    def __init__(self, lines, sections):
+        self.line_texts = lines
+        self.sections = sections
+        self._by_name = {}
+        for section in sections:
+            self._by_name.setdefault(section.name, []).append(section)
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def get(self, name):
+        return self._by_name.get(name, [])
+
+    def lines(self, name):
+        # stripped content lines of every section with this name, blank lines included
+        return [self.line_texts[i].strip()
+                for section in self.get(name) for i in range(section.start_line, section.end_line)]
+
+    def spans(self, name):
+        return [(section.start_char, section.end_char) for section in self.get(name)]
+
+def header_name(line):
+    stripped = line.strip()
+    if not stripped or len(stripped.split()) > MAX_HEADER_WORDS:
+        return None
+    match = HEADER_RE.search(stripped)
+    return match.lastgroup if match else None
+
+def segment_sections(text):
+    lines = text.splitlines(keepends=True)
+    sections = []
+    current = None
+    offset = 0
+    for number, line in enumerate(lines):
+        name = header_name(line)
+        if name is not None:
+            if current is not None:
+                sections.append(current._replace(end_line=number, end_char=offset))
+            current = Section(name, line.strip(), number + 1, None, offset + len(line), None)
+        offset += len(line)
+    if current is not None:
+        sections.append(current._replace(end_line=len(lines), end_char=offset))
+    return SectionIndex(lines, sections)
+# --------------------------------------------------------------------------------
@@ -0,0 +1,109 @@
+import os
+import csv
+import numpy as np
+
+SUGGESTED_SKILLS_CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'sugestedSkills.csv')
+
+def load_role_skills(file_path):
+    # role,skill,skill,... without a header; a role listed twice gets the skills of both rows
+    roles = {}
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for row in csv.reader(file):
+            if not row or not row[0].strip():
+                continue
+            skills = roles.setdefault(row[0].strip(), [])
+            for skill in row[1:]:
+                if skill.strip() and skill.strip() not in skills:
+                    skills.append(skill.strip())
+    return roles
+
+# ----------------------------------Skill Gaps------------------------------------
+class SkillGapRecommender:
+    """Role x skill matrix built from sugestedSkills.csv.
+
+    Coverage of every role for a whole batch of resumes is one matrix product;
+    the matrix is small (roles x suggested skills), so it is kept dense.
+    """
+
+    def __init__(self, csv_path=SUGGESTED_SKILLS_CSV_PATH, state=None):
+        if state is None:
+            state = self.compile(load_role_skills(csv_path))
+        self.roles = state['roles']
+        self.skills = state['skills']
+        self.skill_ids = {skill.lower(): skill_id for skill_id, skill in enumerate(self.skills)}
+        # rank[r, s] is the 1-based position of skill s in role r's list, 0 when the role does not ask for it
+        self.rank = state['rank']
+        self.matrix = (self.rank > 0).astype(np.float32)
+        # a role without skills has coverage 0 rather than 0/0
+        self.role_sizes = np.maximum(self.matrix.sum(axis=1), 1)
+
+    @staticmethod
+    def compile(role_skills):
+        # a role row with no skills has nothing to suggest, so it is left out
+        role_skills = {role: role_skill_list for role, role_skill_list in role_skills.items() if role_skill_list}
+        skills, skill_ids = [], {}
+        for role_skill_list in role_skills.values():
+            for skill in role_skill_list:
+                if skill.lower() not in skill_ids:
+                    skill_ids[skill.lower()] = len(skills)
+                    skills.append(skill)
+        rank = np.zeros((len(role_skills), len(skills)), dtype=np.int16)
+        for role_id, role_skill_list in enumerate(role_skills.values()):
+            for position, skill in enumerate(role_skill_list, start=1):
+                rank[role_id, skill_ids[skill.lower()]] = position
+        return {'roles': list(role_skills), 'skills': skills, 'rank': rank}
+
+    def state(self):
+        return {'roles': self.roles, 'skills': self.skills, 'rank': self.rank}
+
+    @classmethod
+    def from_state(cls, state):
+        return cls(state=state)
+
+    def skill_matrix(self, skill_lists):
+        # resumes x skills indicator matrix; skills no role asks for are ignored
+        matrix = np.zeros((len(skill_lists), len(self.skills)), dtype=np.float32)
+        rows, cols = [], []
+        for row, skills in enumerate(skill_lists):
+            for skill in skills:
+                col = self.skill_ids.get(skill.lower())
+                if col is not None:
+                    rows.append(row)
+                    cols.append(col)
+        matrix[rows, cols] = 1.0
+        return matrix
+
+    def coverage(self, skill_lists):
+        # resumes x roles: share of each role's suggested skills the resume already has
+        return self.skill_matrix(skill_lists) @ self.matrix.T / self.role_sizes
+
+    def recommend_many(self, skill_lists, k=5, batch_size=1024):
+        """Top-k roles per resume by coverage, each with its missing skills in the role's own order."""
+        skill_lists = list(skill_lists)
+        results = []
+        for start in range(0, len(skill_lists), batch_size):
+            have = self.skill_matrix(skill_lists[start:start + batch_size])
+            coverage = have @ self.matrix.T / self.role_sizes
+            top = min(k, len(self.roles))
+            best = np.argpartition(-coverage, top - 1, axis=1)[:, :top]
+            order = np.argsort(-np.take_along_axis(coverage, best, axis=1), axis=1, kind='stable')
+            best = np.take_along_axis(best, order, axis=1)
+
+            # batch x top x skills: position of each skill that a top role wants and the resume lacks
+            missing = self.rank[best] * (have[:, None, :] == 0)
+            for row in range(best.shape[0]):
+                gaps = []
+                for slot, role_id in enumerate(best[row]):
+                    cols = np.flatnonzero(missing[row, slot])
+                    cols = cols[np.argsort(missing[row, slot, cols])]
+                    gaps.append({
+                        'role': self.roles[role_id],
+                        'coverage': round(float(coverage[row, role_id]), 4),
+                        'missing': [self.skills[col] for col in cols],
+                    })
+                results.append(gaps)
+        return results
+
+    def recommend(self, skills, k=5):
+        return self.recommend_many([skills], k=k)[0]
+# --------------------------------------------------------------------------------
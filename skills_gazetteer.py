@@ -0,0 +1,118 @@
+import csv
+import copy
+from collections import namedtuple
+from spacy.tokens import Doc
+from spacy.matcher import PhraseMatcher
+
+SkillMatch = namedtuple('SkillMatch', ['skill', 'start_char', 'end_char'])
+
+# first column header of data/newSkills.csv; it is not a skill
+HEADER_VALUES = {'text'}
+
+def load_skill_keywords(file_paths):
+    keywords = []
+    for file_path in file_paths:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            for row_num, row in enumerate(csv.reader(file)):
+                if not row or not row[0].strip():
+                    continue
+                if row_num == 0 and row[0].strip().lower() in HEADER_VALUES:
+                    continue
+                keywords.append(row[0].strip())
+    return keywords
+
+def token_pattern(doc):
+    # (words, spaces) of a tokenized phrase; a Doc is rebuilt from these without running the tokenizer
+    return [token.text for token in doc], [bool(token.whitespace_) for token in doc]
+
+# ----------------------------------Skill Gazetteer-------------------------------
+def canonical_skills(keywords):
+    # lowercase -> the first spelling seen, which is the one reported back
+    skills = {}
+    for keyword in keywords:
+        skills.setdefault(keyword.lower(), keyword)
+    return skills
+
+class SkillGazetteer:
+    """Token-aware skill lookup compiled once into a PhraseMatcher on LOWER.
+
+    Matching is a single pass over the document's tokens, so its cost follows
+    the resume length rather than the number of skills in the vocabulary.
+    `updated` applies a new keyword list without recompiling: skills added
+    since the last full compile go into a small second matcher and removed
+    ones are filtered out, until the difference outgrows `rebuild_ratio` of
+    the compiled set.
+    """
+
+    def __init__(self, nlp, keywords, patterns=None):
+        self.strings = nlp.vocab.strings
+        self.skills = canonical_skills(keywords)
+        canonical = list(self.skills.values())
+        if patterns is None:
+            patterns = [token_pattern(doc) for doc in nlp.tokenizer.pipe(canonical)]
+        self.patterns = dict(zip(canonical, patterns))
+        self.matcher = self.compile(nlp, canonical)
+        # what self.matcher was compiled with, and the difference applied on top of it since
+        self.compiled = frozenset(canonical)
+        self.extra_matcher = None
+        self.removed_ids = frozenset()
+
+    def compile(self, nlp, keywords):
+        # pre-tokenized patterns (from an artifact bundle or an earlier compile) skip the tokenizer
+        matcher = PhraseMatcher(nlp.vocab, attr='LOWER')
+        for keyword in keywords:
+            words, spaces = self.patterns[keyword]
+            matcher.add(keyword, [Doc(nlp.vocab, words=words, spaces=spaces)])
+        return matcher
+
+    def updated(self, nlp, keywords, rebuild_ratio=0.25):
+        """A new gazetteer for keywords; this one is left untouched for whoever still uses it."""
+        skills = canonical_skills(keywords)
+        wanted = list(skills.values())
+        added = [keyword for keyword in wanted if keyword not in self.compiled]
+        removed = self.compiled.difference(wanted)
+        patterns = {keyword: self.patterns[keyword] for keyword in wanted if keyword in self.patterns}
+        # a keyword can be back in `wanted` after an earlier update dropped its pattern, so every gap is filled
+        unknown = [keyword for keyword in wanted if keyword not in patterns]
+        patterns.update(zip(unknown, (token_pattern(doc) for doc in nlp.tokenizer.pipe(unknown))))
+        if len(added) + len(removed) > rebuild_ratio * max(len(self.compiled), 1):
+            return SkillGazetteer(nlp, wanted, [patterns[keyword] for keyword in wanted])
+
+        gazetteer = copy.copy(self)
+        gazetteer.skills = skills
+        gazetteer.patterns = patterns
+        gazetteer.extra_matcher = gazetteer.compile(nlp, added) if added else None
+        gazetteer.removed_ids = frozenset(self.strings[keyword] for keyword in removed)
+        return gazetteer
+
+    def state(self):
+        return {'keywords': list(self.skills.values()),
+                'patterns': [self.patterns[keyword] for keyword in self.skills.values()]}
+
+    @classmethod
+    def from_state(cls, nlp, state):
+        return cls(nlp, state['keywords'], state['patterns'])
+
+    def __len__(self):
+        return len(self.skills)
+
+    def find(self, doc):
+        matches = []
+        for match_id, start, end in self.matcher(doc):
+            if match_id not in self.removed_ids:
+                span = doc[start:end]
+                matches.append(SkillMatch(self.strings[match_id], span.start_char, span.end_char))
+        if self.extra_matcher is not None:
+            for match_id, start, end in self.extra_matcher(doc):
+                span = doc[start:end]
+                matches.append(SkillMatch(self.strings[match_id], span.start_char, span.end_char))
+            matches.sort(key=lambda match: (match.start_char, match.end_char))
+        return matches
+
+    def match_skills(self, doc):
+        return {match.skill for match in self.find(doc)}
+
+    def canonical(self, text):
+        # the listed spelling of a skill written with other case or spacing; None when it is not listed
+        return self.skills.get(' '.join(text.split()).lower())
+# --------------------------------------------------------------------------------
@@ -0,0 +1,152 @@
+import os
+import sys
+import ast
+import time
+import random
+from collections import namedtuple
+
+import spacy
+from spacy.tokens import DocBin
+from spacy.training import Example
+from spacy.util import minibatch, compounding, fix_random_seed, filter_spans
+
+from skills_gazetteer import SkillGazetteer, load_skill_keywords
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+TRAIN_SCRIPT_PATH = os.path.join(BASE_DIR, 'Training', 'train_model.py')
+SKILLS_CSV_PATHS = (os.path.join(DATA_DIR, 'newSkills.csv'), os.path.join(DATA_DIR, 'UpdatedSkills.csv'))
+CORPUS_DIR = os.path.join(DATA_DIR, 'skills_corpus')
+SKILLS_MODEL_PATH = os.path.join(BASE_DIR, 'TrainedModel', 'skills')
+LABEL = 'SKILL'
+
+# counts from compiling the corpus; dropped holds (text, fragment) for every entity that could not be kept
+CorpusReport = namedtuple('CorpusReport', ['train', 'dev', 'entities', 'repaired', 'dropped'])
+
+# ----------------------------------Training Data---------------------------------
+def load_inline_examples(script_path=TRAIN_SCRIPT_PATH):
+    # UPDATED_TRAIN_DATA is read out of the script's source; importing it would start a training run
+    with open(script_path, 'r', encoding='utf-8') as file:
+        tree = ast.parse(file.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(target, 'id', None) == 'UPDATED_TRAIN_DATA'
+                                                for target in node.targets):
+            return [(text, [tuple(entity) for entity in annotations['entities']])
+                    for text, annotations in ast.literal_eval(node.value)]
+    raise ValueError(f"no UPDATED_TRAIN_DATA in {script_path}")
+
+def load_examples(script_path=TRAIN_SCRIPT_PATH, csv_paths=SKILLS_CSV_PATHS):
+    # the inline sentences plus every skill of the CSVs as a one-entity example; repeated texts are kept once
+    examples = {}
+    for text, entities in load_inline_examples(script_path):
+        examples.setdefault(text.strip(), entities)
+    for skill in load_skill_keywords(csv_paths):
+        examples.setdefault(skill, [(0, len(skill), LABEL)])
+    return list(examples.items())
+
+def align_entities(doc, entities, gazetteer):
+    """Token-aligned entity spans for doc plus the number repaired and the fragments dropped.
+
+    An offset pair that does not fall on token boundaries is moved to the known
+    skill it overlaps most; when it overlaps none it is dropped and reported.
+    """
+    spans, repaired, dropped = [], 0, []
+    matches = None
+    for start, end, label in entities:
+        span = doc.char_span(start, end, label=label)
+        if span is None:
+            if matches is None:
+                matches = gazetteer.find(doc)
+            overlap, match = max(((min(end, match.end_char) - max(start, match.start_char), match)
+                                  for match in matches), key=lambda item: item[0], default=(0, None))
+            if overlap <= 0:
+                dropped.append(doc.text[start:end])
+                continue
+            span = doc.char_span(match.start_char, match.end_char, label=label)
+            repaired += 1
+        spans.append(span)
+    kept = filter_spans(spans)
+    dropped.extend(span.text for span in spans if span not in kept)
+    return kept, repaired, dropped
+
+def compile_corpus(out_dir=CORPUS_DIR, dev_fraction=0.2, seed=0,
+                   script_path=TRAIN_SCRIPT_PATH, csv_paths=SKILLS_CSV_PATHS):
+    """Validate every example once and write train.spacy / dev.spacy under out_dir."""
+    nlp = spacy.blank('en')
+    gazetteer = SkillGazetteer(nlp, load_skill_keywords(csv_paths))
+    docs, entity_count, repaired, dropped = [], 0, 0, []
+    for text, entities in load_examples(script_path, csv_paths):
+        doc = nlp.make_doc(text)
+        spans, doc_repaired, doc_dropped = align_entities(doc, entities, gazetteer)
+        # a sentence that lost an entity leaves its other tokens unannotated rather than teaching them as O
+        doc.set_ents(spans, default='missing' if doc_dropped else 'outside')
+        docs.append(doc)
+        entity_count += len(spans)
+        repaired += doc_repaired
+        dropped.extend((text, fragment) for fragment in doc_dropped)
+
+    random.Random(seed).shuffle(docs)
+    dev_size = max(1, int(len(docs) * dev_fraction))
+    os.makedirs(out_dir, exist_ok=True)
+    DocBin(docs=docs[dev_size:]).to_disk(os.path.join(out_dir, 'train.spacy'))
+    DocBin(docs=docs[:dev_size]).to_disk(os.path.join(out_dir, 'dev.spacy'))
+    return CorpusReport(len(docs) - dev_size, dev_size, entity_count, repaired, dropped)
+
+def read_corpus(nlp, path):
+    # Examples are built once and reused by every epoch
+    return [Example(nlp.make_doc(doc.text), doc) for doc in DocBin().from_disk(path).get_docs(nlp.vocab)]
+# --------------------------------------------------------------------------------
+
+# ----------------------------------Training Loop---------------------------------
+def train(corpus_dir=CORPUS_DIR, output_dir=SKILLS_MODEL_PATH, max_epochs=30, patience=4, seed=0,
+          dropout=0.2, batch_start=4.0, batch_stop=32.0, batch_compound=1.001, log=sys.stderr):
+    """Train the SKILL recognizer and keep the epoch with the best dev F-score in output_dir.
+
+    Stops once `patience` epochs pass without a better dev score.
+    """
+    fix_random_seed(seed)
+    nlp = spacy.blank('en')
+    nlp.add_pipe('ner').add_label(LABEL)
+    train_examples = read_corpus(nlp, os.path.join(corpus_dir, 'train.spacy'))
+    dev_examples = read_corpus(nlp, os.path.join(corpus_dir, 'dev.spacy'))
+    optimizer = nlp.initialize(lambda: train_examples)
+
+    rng = random.Random(seed)
+    sizes = compounding(batch_start, batch_stop, batch_compound)
+    best = {'epoch': 0, 'ents_f': -1.0}
+    for epoch in range(1, max_epochs + 1):
+        started = time.perf_counter()
+        rng.shuffle(train_examples)
+        losses = {}
+        for batch in minibatch(train_examples, size=sizes):
+            nlp.update(batch, drop=dropout, sgd=optimizer, losses=losses)
+        with nlp.use_params(optimizer.averages):
+            scores = nlp.evaluate(dev_examples)
+            f_score = scores['ents_f'] or 0.0
+            if f_score > best['ents_f']:
+                best = {'epoch': epoch, 'ents_f': f_score, 'ents_p': scores['ents_p'] or 0.0,
+                        'ents_r': scores['ents_r'] or 0.0}
+                nlp.meta['performance'] = {key: scores[key] for key in ('ents_f', 'ents_p', 'ents_r')}
+                nlp.to_disk(output_dir)
+        print(f"epoch {epoch:>3}  loss {losses.get('ner', 0.0):10.2f}  dev F {f_score:.3f}  "
+              f"{time.perf_counter() - started:6.1f}s", file=log)
+        if epoch - best['epoch'] >= patience:
+            break
+    return best
+
+def main(args):
+    report = compile_corpus(args.corpus_dir or CORPUS_DIR, dev_fraction=args.dev_fraction, seed=args.seed)
+    print(f"{report.train} train / {report.dev} dev examples, {report.entities} entities, "
+          f"{report.repaired} offsets repaired, {len(report.dropped)} dropped", file=sys.stderr)
+    for text, fragment in report.dropped:
+        print(f"  dropped {fragment!r} in {text!r}", file=sys.stderr)
+    if report.dropped and args.strict:
+        return 1
+
+    output_dir = args.output or SKILLS_MODEL_PATH
+    best = train(args.corpus_dir or CORPUS_DIR, output_dir, max_epochs=args.epochs, patience=args.patience,
+                 seed=args.seed)
+    print(f"best dev F {best['ents_f']:.3f} (P {best['ents_p']:.3f}, R {best['ents_r']:.3f}) "
+          f"at epoch {best['epoch']}, saved to {output_dir}", file=sys.stderr)
+    return 0
+# --------------------------------------------------------------------------------
@@ -0,0 +1,216 @@
+import os
+import csv
+import time
+import logging
+import hashlib
+import threading
+from contextlib import contextmanager
+from collections import namedtuple
+
+from artifacts import bundle_fingerprint, read_bundle, write_bundle
+from skills_gazetteer import SkillGazetteer, load_skill_keywords
+from position_scorer import PositionScorer, load_positions_keywords
+from skill_gap import SkillGapRecommender
+from languages import LanguageTable
+
+logger = logging.getLogger(__name__)
+
+# the keyword tables a parse uses, as of one version of the CSVs; never modified once built
+Taxonomy = namedtuple('Taxonomy', ['version', 'checksums', 'skills_gazetteer', 'major_keywords',
+                                   'position_scorer', 'gap_recommender', 'language_table'])
+
+# the files behind every table; each kind maps to a tuple of paths
+TAXONOMY_KINDS = ('skills', 'majors', 'positions', 'skill_gaps', 'languages')
+
+def load_keywords(file_path):
+    with open(file_path, 'r', encoding='utf-8') as file:
+        reader = csv.reader(file)
+        return set(row[0] for row in reader)
+
+def major_keyword_pairs(file_path):
+    # keep the keywords paired with their lowercase form so matching never re-lowers them
+    return [(keyword, keyword.lower()) for keyword in load_keywords(file_path)]
+
+def file_checksum(file_path):
+    with open(file_path, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+def file_stat(file_path):
+    # (mtime, size), or None while the file is missing (e.g. halfway through being replaced)
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def taxonomy_version(checksums):
+    # the same CSV contents give the same version in every process
+    digest = hashlib.sha256()
+    for file_path, checksum in checksums.items():
+        digest.update(f"{os.path.basename(file_path)}:{checksum}\n".encode('utf-8'))
+    return digest.hexdigest()[:12]
+
+def taxonomy_tables(taxonomy):
+    # what an artifact bundle stores
+    return {'skills': taxonomy.skills_gazetteer.state(), 'majors': taxonomy.major_keywords,
+            'positions': taxonomy.position_scorer.state(), 'skill_gaps': taxonomy.gap_recommender.state(),
+            'languages': taxonomy.language_table.state()}
+
+# ----------------------------------Taxonomy Registry-----------------------------
+class TaxonomyRegistry:
+    """The current Taxonomy, reloaded when one of its CSVs changes.
+
+    `maybe_reload` stats the files at most once per `check_interval` seconds
+    and only hashes a file whose mtime or size moved. A change rebuilds the
+    tables of that file alone, reusing what it can (the compiled skill
+    matcher, the position lemmas), and the new snapshot replaces the old one
+    in a single assignment. Code inside `pinned()` keeps the snapshot it
+    started with, so a parse never mixes two versions.
+    """
+
+    def __init__(self, nlp, paths, artifacts_path=None, check_interval=5.0):
+        self.nlp = nlp
+        self.paths = {kind: tuple(paths[kind]) for kind in TAXONOMY_KINDS}
+        self.check_interval = check_interval
+        self.reloads = 0
+        self.last_reload_seconds = None
+        self.last_reload_at = None
+        self.last_changes = {}
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        files = [file_path for kind in TAXONOMY_KINDS for file_path in self.paths[kind]]
+        self._stats = {file_path: file_stat(file_path) for file_path in files}
+        self.current = self._load({file_path: file_checksum(file_path) for file_path in files}, artifacts_path)
+        self._next_check = time.monotonic() + (check_interval or 0)
+
+    def _load(self, checksums, artifacts_path):
+        # from the artifact bundle when it matches these CSVs, else compiled from the CSVs (and the bundle rewritten)
+        tables = fingerprint = None
+        if artifacts_path:
+            fingerprint = bundle_fingerprint(self.nlp, list(checksums))
+            tables = read_bundle(artifacts_path, fingerprint)
+        if tables is not None:
+            taxonomy = Taxonomy(taxonomy_version(checksums), checksums,
+                                SkillGazetteer.from_state(self.nlp, tables['skills']),
+                                tables['majors'],
+                                PositionScorer.from_state(self.nlp, tables['positions']),
+                                SkillGapRecommender.from_state(tables['skill_gaps']),
+                                LanguageTable.from_state(tables['languages']))
+        else:
+            taxonomy = Taxonomy(taxonomy_version(checksums), checksums,
+                                SkillGazetteer(self.nlp, load_skill_keywords(self.paths['skills'])),
+                                major_keyword_pairs(*self.paths['majors']),
+                                PositionScorer(self.nlp, *self.paths['positions']),
+                                SkillGapRecommender(*self.paths['skill_gaps']),
+                                LanguageTable(*self.paths['languages']))
+            if artifacts_path:
+                write_bundle(artifacts_path, fingerprint, taxonomy_tables(taxonomy))
+        return taxonomy
+
+    # ----------------------------------Snapshots---------------------------------
+    def snapshot(self):
+        return getattr(self._local, 'pinned', None) or self.current
+
+    @contextmanager
+    def pinned(self, taxonomy=None):
+        # nested pins keep the outermost snapshot
+        outer = getattr(self._local, 'pinned', None)
+        self._local.pinned = outer or taxonomy or self.current
+        try:
+            yield self._local.pinned
+        finally:
+            self._local.pinned = outer
+
+    # ----------------------------------Reloading---------------------------------
+    def maybe_reload(self):
+        # cheap enough to call before every parse
+        if self.check_interval is None or time.monotonic() < self._next_check:
+            return False
+        return self.check()
+
+    def check(self):
+        """Reload the tables whose files changed on disk; True when a new snapshot was swapped in.
+
+        A reload that fails (e.g. a CSV saved halfway) is logged and the previous
+        tables stay in use; the files are looked at again on the next check.
+        """
+        self._next_check = time.monotonic() + (self.check_interval or 0)
+        changed, stats = {}, {}
+        for file_path, known in self._stats.items():
+            stat = file_stat(file_path)
+            if stat is None or stat == known:
+                continue
+            stats[file_path] = stat
+            checksum = file_checksum(file_path)
+            if checksum != self.current.checksums[file_path]:
+                changed[file_path] = checksum
+        try:
+            reloaded = bool(changed) and self.reload(changed) is not None
+        except Exception as exc:
+            self.last_error = f"{type(exc).__name__}: {exc}"
+            logger.exception("taxonomy reload failed, keeping version %s", self.current.version)
+            return False
+        # only now are the new mtimes known to be applied
+        self._stats.update(stats)
+        self.last_error = None
+        return reloaded
+
+    def reload(self, checksums=None):
+        """Apply the given {path: checksum} (every file re-hashed when None); the new snapshot, or None."""
+        with self._lock:
+            started = time.perf_counter()
+            old = self.current
+            if checksums is None:
+                checksums = {file_path: file_checksum(file_path) for file_path in old.checksums}
+            checksums = {**old.checksums, **checksums}
+            kinds = [kind for kind in TAXONOMY_KINDS
+                     if any(checksums[file_path] != old.checksums[file_path] for file_path in self.paths[kind])]
+            if not kinds:
+                return None
+            new, changes = self._apply(old, kinds, checksums)
+            # one reference assignment: a parse that is not pinned yet gets either snapshot, never a mix
+            self.current = new
+            self.reloads += 1
+            self.last_reload_seconds = time.perf_counter() - started
+            self.last_reload_at = time.time()
+            self.last_changes = changes
+            return new
+
+    def _apply(self, old, kinds, checksums):
+        tables, changes = {}, {}
+        if 'skills' in kinds:
+            gazetteer = old.skills_gazetteer.updated(self.nlp, load_skill_keywords(self.paths['skills']))
+            before, after = set(old.skills_gazetteer.skills.values()), set(gazetteer.skills.values())
+            changes['skills'] = {'added': len(after - before), 'removed': len(before - after)}
+            tables['skills_gazetteer'] = gazetteer
+        if 'majors' in kinds:
+            majors = major_keyword_pairs(*self.paths['majors'])
+            before, after = set(old.major_keywords), set(majors)
+            changes['majors'] = {'added': len(after - before), 'removed': len(before - after)}
+            tables['major_keywords'] = majors
+        if 'positions' in kinds:
+            state = PositionScorer.compile(self.nlp, load_positions_keywords(*self.paths['positions']),
+                                           previous=old.position_scorer.state())
+            before, after = set(old.position_scorer.keywords), set(state['keywords'])
+            changes['positions'] = {'added': len(after - before), 'removed': len(before - after)}
+            tables['position_scorer'] = PositionScorer.from_state(self.nlp, state)
+        # the skill-gap matrix and the language tables are a few hundred rows; rebuilding them is the cheap path
+        if 'skill_gaps' in kinds:
+            tables['gap_recommender'] = SkillGapRecommender(*self.paths['skill_gaps'])
+            changes['skill_gaps'] = {'roles': len(tables['gap_recommender'].roles)}
+        if 'languages' in kinds:
+            tables['language_table'] = LanguageTable(*self.paths['languages'])
+            changes['languages'] = {'languages': len(tables['language_table'].languages)}
+        return old._replace(version=taxonomy_version(checksums), checksums=checksums, **tables), changes
+
+    def stats(self):
+        return {
+            'version': self.current.version,
+            'reloads': self.reloads,
+            'last_reload_ms': self.last_reload_seconds * 1000 if self.last_reload_seconds is not None else None,
+            'last_reload_at': self.last_reload_at,
+            'last_changes': self.last_changes,
+            'last_error': self.last_error,
+        }
+# --------------------------------------------------------------------------------